@@ -1,10 +1,19 @@
+from functools import lru_cache
+
 from fastapi import APIRouter
 
 from app.core.config import settings
+from app.core.json_response import encode_json, json_response
+from app.schemas.config import ConfigResponse
 
 router = APIRouter()
 
 
-@router.get("/config")
-def get_config():
-    return {"crypto": settings.crypto_coins, "stablecoins": settings.stable_coins}
+@router.get("/config", response_model=ConfigResponse)
+async def get_config():
+    return json_response(_config_body(tuple(settings.crypto_coins), tuple(settings.stable_coins)))
+
+
+@lru_cache(maxsize=1)
+def _config_body(crypto_coins: tuple[str, ...], stable_coins: tuple[str, ...]) -> bytes:
+    return encode_json({"crypto": list(crypto_coins), "stablecoins": list(stable_coins)})
@@ -1,16 +1,20 @@
 import logging
+from typing import Optional
 
 from fastapi import APIRouter, Header, HTTPException, Request, status
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
-from app.fetcher import run_fetcher
+
+# app.services.fetch_jobs pulls in the whole fetcher (httpx, every provider).
+# It's imported inside the routes so that cold starts serving /api/prices
+# don't pay for it; the first cron call does.
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def get_request_ip(request: Request, x_forwarded_for: str | None) -> str:
+def get_request_ip(request: Request, x_forwarded_for: Optional[str]) -> str:
     if x_forwarded_for:
         forwarded_ips = [ip.strip() for ip in x_forwarded_for.split(",") if ip.strip()]
         if forwarded_ips:
@@ -20,12 +24,12 @@ def get_request_ip(request: Request, x_forwarded_for: str | None) -> str:
     return "unknown"
 
 
-@router.get("/cron/fetcher")
-async def run_fetcher_from_cron(
+def authorize_cron_request(
     request: Request,
-    authorization: str | None = Header(default=None),
-    x_forwarded_for: str | None = Header(default=None),
-):
+    authorization: Optional[str],
+    x_forwarded_for: Optional[str],
+) -> str:
+    """Check the cron secret (and IP allowlist, if set). Returns the caller's IP."""
     expected_secret = settings.cron_secret
     request_ip = get_request_ip(request, x_forwarded_for)
 
@@ -54,12 +58,65 @@ async def run_fetcher_from_cron(
             detail="Forbidden",
         )
 
-    logger.info("Cron fetcher started from ip=%s", request_ip)
+    return request_ip
+
+
+@router.get("/cron/fetcher")
+async def run_fetcher_from_cron(
+    request: Request,
+    wait: Optional[bool] = None,
+    authorization: Optional[str] = Header(default=None),
+    x_forwarded_for: Optional[str] = Header(default=None),
+):
+    """
+    Start a fetch job (or attach to the running one) and return its id with 202.
+
+    With ?wait=true the response is held until the job finishes and carries the
+    job status instead. That is the default on serverless, where work left
+    running after the response is frozen with the function.
+    """
+    request_ip = authorize_cron_request(request, authorization, x_forwarded_for)
+    from app.services.fetch_jobs import JOB_FAILED, JOB_RUNNING, FetchAlreadyRunning, start_fetch_job, wait_for_job
+
     try:
-        await run_fetcher()
-    except Exception:
-        logger.exception("Cron fetcher failed from ip=%s", request_ip)
-        raise
+        handle = await start_fetch_job(trigger_ip=request_ip)
+    except FetchAlreadyRunning as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+
+    if handle.attached:
+        logger.info("Cron fetcher from ip=%s attached to running job %s", request_ip, handle.job_id)
+
+    if wait is None:
+        wait = settings.serverless
+    if wait:
+        job = await wait_for_job(handle, timeout=settings.fetch_budget_seconds + 5)
+        if job and job["status"] != JOB_RUNNING:
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR if job["status"] == JOB_FAILED else status.HTTP_200_OK
+            return JSONResponse(job, status_code=status_code)
+
+    return JSONResponse(
+        {
+            "job_id": handle.job_id,
+            "status": JOB_RUNNING,
+            "attached": handle.attached,
+            "status_url": f"/api/cron/jobs/{handle.job_id}",
+        },
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
+
+@router.get("/cron/jobs/{job_id}")
+def get_fetch_job_status(
+    job_id: str,
+    request: Request,
+    authorization: Optional[str] = Header(default=None),
+    x_forwarded_for: Optional[str] = Header(default=None),
+):
+    """Status, duration and per-provider outcome of a fetch job."""
+    authorize_cron_request(request, authorization, x_forwarded_for)
+    from app.services.fetch_jobs import get_fetch_job
 
-    logger.info("Cron fetcher completed successfully from ip=%s", request_ip)
-    return PlainTextResponse("ok")
+    job = get_fetch_job(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
@@ -1,4 +1,10 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Header, Request
+
+from app.api.routes.cron import authorize_cron_request
+from app.core.config import settings
+from app.db.pool import async_pool_metrics, pool_metrics
 
 router = APIRouter()
 
@@ -6,3 +12,17 @@ router = APIRouter()
 @router.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@router.get("/health/db")
+def db_pool_health(
+    request: Request,
+    authorization: Optional[str] = Header(default=None),
+    x_forwarded_for: Optional[str] = Header(default=None),
+):
+    """
+    Connection pool metrics for this process (see app/db/pool.py); "async" is
+    the read routes' asyncpg pool. Operational data: same credentials as the cron routes.
+    """
+    authorize_cron_request(request, authorization, x_forwarded_for)
+    return {"pool_mode": settings.db_pool_mode, **pool_metrics.snapshot(), "async": async_pool_metrics.snapshot()}
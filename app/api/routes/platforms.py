@@ -3,40 +3,43 @@ import json
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import RedirectResponse
-from sqlmodel import Session, select
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.deps import verify_admin
-from app.db.session import get_session
+from app.core.http_cache import (
+    PRIVATE_CACHE_CONTROL,
+    PUBLIC_CACHE_CONTROL,
+    apply_cache_headers,
+    is_not_modified,
+    not_modified_response,
+)
+from app.core.json_response import json_response
+from app.db.session import get_async_session, get_session
 from app.i18n import PLATFORM_NOT_FOUND, REFERRAL_NOT_CONFIGURED, get_lang, t
 from app.models import PlatformInfo, PlatformReferralClick
-from app.schemas.platform import PlatformUpdate
+from app.schemas.platform import PlatformItem, PlatformUpdate
+from app.services.data_version import bump_data_version, data_changed
+from app.services.manual_prices import sync_manual_prices
+from app.services.platform_snapshot import get_cached_platforms
 
 router = APIRouter()
 
 
-_LOCALIZABLE_FIELDS = ("funding", "trading", "withdraw", "deposit_networks", "withdraw_networks")
-
-
-@router.get("/platforms")
-def get_platforms(request: Request, all: bool = False, session: Session = Depends(get_session)):
-    statement = select(PlatformInfo) if all else select(PlatformInfo).where(PlatformInfo.is_active == True)
-    result = session.exec(statement)
+@router.get("/platforms", response_model=dict[str, PlatformItem])
+async def get_platforms(request: Request, all: bool = False):
+    """Active platforms (all=true: every platform, the admin view), from the platform snapshot."""
     lang = get_lang(request)
+    cached = await get_cached_platforms(lang, all)
+    # all=true is the admin view and is never shared
+    cache_control = PRIVATE_CACHE_CONTROL if all else PUBLIC_CACHE_CONTROL
+    if is_not_modified(request, cached.etag):
+        return not_modified_response(cached.etag, cache_control=cache_control, vary="Accept-Language")
 
-    platforms = {}
-    for platform in result:
-        item = platform.model_dump()
-        if isinstance(item["manual_prices"], str):
-            item["manual_prices"] = json.loads(item["manual_prices"])
-
-        if lang == "en":
-            for field in _LOCALIZABLE_FIELDS:
-                en_val = (item.get(f"{field}_en") or "").strip()
-                if en_val:
-                    item[field] = en_val
-
-        platforms[item["id"]] = item
-    return platforms
+    # Encoded once per data version; response_model only documents it
+    response = json_response(cached.body)
+    apply_cache_headers(response, cached.etag, cache_control=cache_control, vary="Accept-Language")
+    return response
 
 
 @router.post("/admin/platforms", dependencies=[Depends(verify_admin)])
@@ -67,7 +70,10 @@ def save_platform(data: PlatformUpdate, session: Session = Depends(get_session))
         last_updated=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
     )
     session.merge(platform)
+    sync_manual_prices(session, platform.id, platform.category, data.manual_prices)
+    version = bump_data_version(session)
     session.commit()
+    data_changed(version)
     return {"status": "success"}
 
 
@@ -76,13 +82,15 @@ def delete_platform(platform_id: str, session: Session = Depends(get_session)):
     platform = session.get(PlatformInfo, platform_id.lower())
     if platform:
         session.delete(platform)
+        version = bump_data_version(session)
         session.commit()
+        data_changed(version)
     return {"status": "success"}
 
 
 @router.get("/r/{platform_id}")
-def redirect_referral(platform_id: str, request: Request, session: Session = Depends(get_session)):
-    platform = session.get(PlatformInfo, platform_id.lower())
+async def redirect_referral(platform_id: str, request: Request, session: AsyncSession = Depends(get_async_session)):
+    platform = await session.get(PlatformInfo, platform_id.lower())
     lang = get_lang(request)
     if not platform or not platform.is_active:
         raise HTTPException(status_code=404, detail=t(PLATFORM_NOT_FOUND, lang))
@@ -98,6 +106,6 @@ def redirect_referral(platform_id: str, request: Request, session: Session = Dep
         user_agent=request.headers.get("user-agent", ""),
     )
     session.add(click)
-    session.commit()
+    await session.commit()
 
     return RedirectResponse(destination_url, status_code=302)
@@ -1,13 +1,180 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
+import asyncio
+from contextlib import aclosing
+from typing import Optional
 
-from app.db.session import get_session
-from app.schemas.price import PriceResponse
-from app.services.pricing import build_price_response
+from fastapi import APIRouter, Header, HTTPException, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.http_cache import apply_cache_headers, content_etag, is_not_modified, not_modified_response
+from app.core.json_response import encode_json, json_response
+from app.schemas.price import PriceResponse, PricesResponse
+from app.services.price_snapshot import get_cached_price_async, get_cached_prices_async, price_delta
+from app.services.price_stream import StreamFull, price_broadcaster
 
 router = APIRouter()
 
+MAX_BATCH_COINS = 20
+
+
+@router.get("/prices", response_model=PricesResponse)
+async def get_all_prices(request: Request, coins: Optional[str] = None, since: Optional[int] = None):
+    """
+    Every coin in one response: {"coins": [{"coin": "btc", "prices": [...]}, ...]}.
+    `?coins=btc,eth` picks the coins (in that order); the default is every
+    configured coin. Each entry is exactly what /prices/{coin} returns.
+
+    With `?since=<version>`: {"version": ..., "coins": [<delta>, ...]}, one
+    /prices/{coin}?since= delta per coin.
+    """
+    requested = [coin.strip() for coin in coins.split(",") if coin.strip()] if coins else (
+        settings.crypto_coins + settings.stable_coins
+    )
+    if not requested:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No coins requested.")
+    if len(requested) > MAX_BATCH_COINS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_COINS} coins per request.",
+        )
+
+    cached = await get_cached_prices_async(requested)
+    if since is not None:
+        deltas = [price_delta(entry, since) for entry in cached]
+        version = max(entry.response["version"] for entry in cached)
+        return _delta_response(request, {"version": version, "coins": deltas})
+
+    etag = content_etag([entry.etag for entry in cached])
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    # Each coin's body is already encoded: splice them instead of encoding again
+    body = b'{"coins":[' + b",".join(entry.body for entry in cached) + b"]}"
+    return _cached_response(body, etag)
+
+
+# Declared before /prices/{coin}, which would otherwise take "stream" for a coin
+@router.get("/prices/stream")
+async def stream_prices(
+    coins: Optional[str] = None,
+    since: Optional[int] = None,
+    last_event_id: Optional[int] = Header(default=None),
+):
+    """
+    Server-Sent Events: one `prices` event per data version, with the event id
+    set to the version. The first event carries every price (or, with
+    `?since=<version>`, what changed since then); each later one the delta
+    since the previous event, shaped like /prices?since=. Browsers reconnect
+    with Last-Event-ID and pick up where they left off.
+    """
+    requested = _stream_coins(coins)
+    _check_stream_capacity()
+    start = since if since is not None else last_event_id
+
+    async def events():
+        async with aclosing(price_broadcaster.updates(requested, start)) as updates:
+            async for version, payload in updates:
+                yield ": keep-alive\n\n" if payload is None else f"id: {version}\nevent: prices\ndata: {payload}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/prices/stream")
+async def stream_prices_ws(websocket: WebSocket, coins: Optional[str] = None, since: Optional[int] = None):
+    """The same updates as the SSE stream, one JSON text message per data version."""
+    try:
+        requested = _stream_coins(coins)
+        _check_stream_capacity()
+    except HTTPException as exc:
+        await websocket.close(code=1008 if exc.status_code == status.HTTP_400_BAD_REQUEST else 1013, reason=exc.detail)
+        return
+
+    await websocket.accept()
+
+    async def send_updates() -> None:
+        async with aclosing(price_broadcaster.updates(requested, since)) as updates:
+            async for _version, payload in updates:
+                if payload is not None:
+                    await websocket.send_text(payload)
+
+    async def wait_for_disconnect() -> None:
+        # Sends may be minutes apart: without reading, a client that left
+        # would hold its subscriber slot until the next one fails
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass  # clients have nothing to say; ignore what they send
+
+    tasks = {asyncio.create_task(send_updates()), asyncio.create_task(wait_for_disconnect())}
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception) and not isinstance(result, WebSocketDisconnect):
+            raise result
+
 
 @router.get("/prices/{coin}", response_model=PriceResponse)
-def get_prices(coin: str, session: Session = Depends(get_session)):
-    return build_price_response(session, coin)
+async def get_prices(coin: str, request: Request, since: Optional[int] = None):
+    """
+    The prices for one coin, with the data version they were built at.
+
+    Pass that version back as `?since=<version>` to get only what changed:
+    rows added or changed, exchanges removed, and refreshed last_updated
+    timestamps (see price_delta()). Unknown versions get the full list with
+    "full": true.
+    """
+    cached = await get_cached_price_async(coin)
+    if since is not None:
+        return _delta_response(request, price_delta(cached, since))
+    if is_not_modified(request, cached.etag):
+        return not_modified_response(cached.etag)
+    return _cached_response(cached.body, cached.etag)
+
+
+def _cached_response(body: bytes, etag: str) -> Response:
+    # Sent as encoded, bypassing response_model (which still documents the
+    # full responses; deltas don't fit it)
+    response = json_response(body)
+    apply_cache_headers(response, etag)
+    return response
+
+
+def _delta_response(request: Request, payload: dict) -> Response:
+    # The delta depends on the history this process kept: another instance may
+    # answer the same URL with "full": true. Both are valid answers, so the
+    # ETag is a hash of this body, and a shared cache revalidating against a
+    # different instance gets the new body instead of a 304 for the old one.
+    body = encode_json(payload)
+    etag = content_etag(payload)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    return _cached_response(body, etag)
+
+
+def _stream_coins(coins: Optional[str]) -> list[str]:
+    configured = settings.crypto_coins + settings.stable_coins
+    if not coins:
+        return configured
+    requested = list(dict.fromkeys(coin.strip().lower() for coin in coins.split(",") if coin.strip()))
+    unknown = [coin for coin in requested if coin not in configured]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Only configured coins can be streamed: {', '.join(configured)}.",
+        )
+    return requested
+
+
+def _check_stream_capacity() -> None:
+    try:
+        price_broadcaster.check_capacity()
+    except StreamFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many price stream subscribers; poll /api/prices instead.",
+        )
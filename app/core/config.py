@@ -15,6 +15,64 @@ class Settings:
     cron_secret: Optional[str] = os.getenv("CRON_SECRET")
     cron_allowed_ips_raw: str = os.getenv("CRON_ALLOWED_IPS", "")
 
+    # Vercel sets VERCEL=1 in every serverless function.
+    serverless: bool = bool(os.getenv("VERCEL"))
+
+    # Connection pooling. "null" opens a connection per checkout and closes it
+    # afterwards (serverless default: instances don't hoard idle connections);
+    # "queue" keeps a pool per process (long-lived workers).
+    db_pool_mode: str = os.getenv("DB_POOL_MODE", "null" if serverless else "queue")
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    db_pool_timeout_seconds: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+    db_pool_recycle_seconds: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "300"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+    # Set when DB_HOST is a transaction-mode PgBouncer (or Supabase's pooler on 6543)
+    db_pgbouncer: bool = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+    db_connect_timeout_seconds: int = int(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "5"))
+    db_statement_timeout_ms: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+
+    # Total wall-clock seconds a fetch run may take before slow providers are cut off.
+    fetch_budget_seconds: float = float(os.getenv("FETCH_BUDGET_SECONDS", "25"))
+
+    # Max requests the fetcher keeps in flight per exchange host.
+    fetch_host_concurrency: int = int(os.getenv("FETCH_HOST_CONCURRENCY", "4"))
+
+    # Retries per idempotent request on timeouts/429/5xx, and the per-provider circuit
+    # breaker: after N consecutive failed runs the provider is skipped for the cooldown.
+    # The default cooldown is one fetch interval: the breaker opens during a run,
+    # so the next scheduled run starts before it ends and skips the provider.
+    fetch_max_retries: int = int(os.getenv("FETCH_MAX_RETRIES", "2"))
+    fetch_breaker_threshold: int = int(os.getenv("FETCH_BREAKER_THRESHOLD", "3"))
+    fetch_breaker_cooldown_seconds: float = float(
+        os.getenv("FETCH_BREAKER_COOLDOWN_SECONDS") or os.getenv("FETCH_INTERVAL_SECONDS", "900")
+    )
+
+    # Market discovery catalogues (Bitso books, Buda markets) barely change, so
+    # they are cached across runs. Backend is "db" or "file"; serverless defaults to a file in /tmp.
+    discovery_cache_ttl_seconds: int = int(os.getenv("DISCOVERY_CACHE_TTL_SECONDS", "86400"))
+    discovery_cache_backend: str = os.getenv("DISCOVERY_CACHE_BACKEND", "file" if serverless else "db")
+    discovery_cache_path: str = os.getenv("DISCOVERY_CACHE_PATH", "/tmp/mejortasas_discovery_cache.json")
+
+    # Max age of the in-memory /api/prices snapshot. Local writes invalidate it at
+    # once; this bounds how long writes made by other instances take to show up.
+    price_snapshot_ttl_seconds: float = float(os.getenv("PRICE_SNAPSHOT_TTL_SECONDS", "30"))
+
+    # How API processes learn about writes made elsewhere: "listen" (Postgres
+    # LISTEN/NOTIFY), "poll" (read data_version periodically) or "off".
+    data_version_mode: str = os.getenv("DATA_VERSION_MODE", "poll" if serverless or db_pgbouncer else "listen")
+    data_version_poll_seconds: float = float(os.getenv("DATA_VERSION_POLL_SECONDS", "5"))
+
+    # GET /api/prices/stream: connections accepted per worker, and seconds of
+    # quiet before a keep-alive is sent (keeps proxies from closing idle streams).
+    price_stream_max_subscribers: int = int(os.getenv("PRICE_STREAM_MAX_SUBSCRIBERS", "5000"))
+    price_stream_keepalive_seconds: float = float(os.getenv("PRICE_STREAM_KEEPALIVE_SECONDS", "15"))
+
+    # HTTP caching of /api/prices and /api/platforms: the edge may serve a response
+    # for CACHE_S_MAXAGE_SECONDS, then stale for up to one fetch interval while revalidating.
+    cache_s_maxage_seconds: int = int(os.getenv("CACHE_S_MAXAGE_SECONDS", "60"))
+    fetch_interval_seconds: int = int(os.getenv("FETCH_INTERVAL_SECONDS", "900"))
+
     admin_user: str = os.getenv("ADMIN_USER", "m4cc1")
     admin_pass: str = os.getenv("ADMIN_PASS", "TDNMunera_06*")
     admin_token: str = os.getenv("ADMIN_TOKEN", "crypto_spread_secret_token_2026")
@@ -26,6 +84,10 @@ class Settings:
     def database_url(self) -> str:
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    @property
+    def async_database_url(self) -> str:
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+
     @property
     def cron_allowed_ips(self) -> list[str]:
         return [
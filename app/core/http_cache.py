@@ -0,0 +1,68 @@
+"""
+http_cache.py — Conditional GET and Cache-Control for read endpoints.
+
+Prices and platforms change at most once per fetch run (every
+FETCH_INTERVAL_SECONDS) or on an admin save, so:
+
+  - responses carry a strong ETag, a hash of their content. There is no
+    Last-Modified: no timestamp moves with every change (deactivating a
+    platform or deleting a row leaves the newest last_updated alone), so an
+    If-Modified-Since check would keep stale bodies;
+  - a matching If-None-Match gets a bodiless 304. Callers check this before
+    building the body;
+  - public responses may be kept by the Vercel edge for CACHE_S_MAXAGE_SECONDS
+    and served stale while it revalidates for up to a fetch interval.
+    Browsers always revalidate (max-age=0), which is cheap thanks to the 304s.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+PUBLIC_CACHE_CONTROL = (
+    f"public, max-age=0, s-maxage={settings.cache_s_maxage_seconds}, "
+    f"stale-while-revalidate={settings.fetch_interval_seconds}"
+)
+# Admin views: never shared, always revalidated
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+def content_etag(payload: Any) -> str:
+    """Strong ETag from the JSON content itself: identical on every instance."""
+    digest = hashlib.sha256(orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def is_not_modified(request: Request, etag: Optional[str]) -> bool:
+    """True when the client's copy is current: If-None-Match lists `etag` (or "*")."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is None or etag is None:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def apply_cache_headers(
+    response: Response,
+    etag: Optional[str],
+    cache_control: str = PUBLIC_CACHE_CONTROL,
+    vary: Optional[str] = None,
+) -> None:
+    if etag:
+        response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if vary:
+        response.headers["Vary"] = vary
+
+
+def not_modified_response(
+    etag: Optional[str],
+    cache_control: str = PUBLIC_CACHE_CONTROL,
+    vary: Optional[str] = None,
+) -> Response:
+    response = Response(status_code=304)
+    apply_cache_headers(response, etag, cache_control, vary)
+    return response
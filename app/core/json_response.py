@@ -0,0 +1,25 @@
+"""
+json_response.py — JSON response bodies encoded once, with orjson.
+
+The hot read endpoints serve content that only changes with the data version,
+so their bodies are encoded when that content is built (CachedPrice.body, the
+platforms payload, /api/config) and sent as bytes. Returning a Response skips
+FastAPI's per-request work: response_model validation, jsonable_encoder and
+the stdlib json encoder. The routes keep their response_model, so the schema
+is still documented in OpenAPI.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+
+def encode_json(payload: Any) -> bytes:
+    """Compact JSON; types orjson doesn't know (Decimal, …) as str, like json.dumps(default=str)."""
+    return orjson.dumps(payload, default=str)
+
+
+def json_response(body: bytes, status_code: int = 200) -> Response:
+    """A response carrying `body`, which is already encoded JSON."""
+    return Response(content=body, status_code=status_code, media_type="application/json")
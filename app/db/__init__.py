@@ -1 +1 @@
-from .session import create_db_and_tables, engine, get_session
+from .session import engine, get_async_engine, get_async_session, get_session, run_in_db_thread
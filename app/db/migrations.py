@@ -0,0 +1,303 @@
+"""
+migrations.py — Versioned schema changes, tracked in the schema_version table.
+
+Apply pending migrations explicitly, once per deploy that changes the schema:
+  .venv/bin/python3 migrate.py            # apply pending migrations
+  .venv/bin/python3 migrate.py --status   # print current vs. latest version
+
+The API and the fetcher never run DDL themselves. They only compare the
+database version with LATEST_VERSION (one cached query per process) and
+complain when the database is behind.
+
+Adding a migration: append a Migration with the next version number to
+MIGRATIONS. Version 1 creates the baseline tables from the current models, so
+on a fresh database later migrations run against tables that may already have
+their change: write them idempotently (IF NOT EXISTS / IF EXISTS).
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import ProgrammingError
+from sqlmodel import SQLModel
+
+from app.db.session import engine
+from app.models import ManualPrice
+from app.services.manual_prices import resolve_manual_prices
+
+logger = logging.getLogger(__name__)
+
+# Serializes concurrent `migrations` runs (two deploys at once).
+MIGRATION_LOCK_KEY = 7_302_114_053
+
+
+@dataclass
+class Migration:
+    """
+    One schema change.
+
+      version     — position in MIGRATIONS, starting at 1
+      description — shown by --status and stored in schema_version
+      steps       — SQL statements, or a callable taking the Connection
+    """
+    version: int
+    description: str
+    steps: Union[list[str], Callable[[Connection], None]]
+
+
+# Tables that existed when versioned migrations were introduced.
+BASELINE_TABLES = (
+    "crypto_prices",
+    "stablecoin_prices",
+    "platform_info",
+    "platform_referral_click",
+    "provider_heartbeat",
+    "discovery_cache",
+    "fetch_job",
+)
+
+
+def _create_baseline_tables(connection: Connection) -> None:
+    tables = [SQLModel.metadata.tables[name] for name in BASELINE_TABLES]
+    SQLModel.metadata.create_all(connection, tables=tables)
+
+
+def _create_manual_price_table(connection: Connection) -> None:
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS manual_price ("
+            " platform_id VARCHAR NOT NULL REFERENCES platform_info (id) ON DELETE CASCADE,"
+            " coin VARCHAR NOT NULL,"
+            " currency VARCHAR NOT NULL,"
+            " buy VARCHAR,"
+            " sell VARCHAR,"
+            " buy_cop FLOAT,"
+            " sell_cop FLOAT,"
+            " active BOOLEAN NOT NULL,"
+            " PRIMARY KEY (platform_id, coin))"
+        )
+    )
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_manual_price_coin ON manual_price (coin)"))
+
+    # Convert the existing JSON blobs
+    platforms = connection.execute(text("SELECT id, category, manual_prices FROM platform_info")).all()
+    for platform_id, category, manual_prices in platforms:
+        rows = [
+            row.model_dump()
+            for row in resolve_manual_prices(platform_id, category, json.loads(manual_prices or "{}"))
+        ]
+        if rows:
+            connection.execute(insert(ManualPrice.__table__).values(rows).on_conflict_do_nothing())
+
+
+# Price timestamps stored as "2024-04-03 15:00:00 UTC" strings until migration 5
+TYPED_TIMESTAMP_COLUMNS = (
+    ("crypto_prices", "last_updated"),
+    ("stablecoin_prices", "last_updated"),
+    ("provider_heartbeat", "last_checked"),
+)
+
+
+def _type_price_timestamps(connection: Connection) -> None:
+    for table, column in TYPED_TIMESTAMP_COLUMNS:
+        data_type = connection.execute(
+            text("SELECT data_type FROM information_schema.columns WHERE table_name = :table AND column_name = :column"),
+            {"table": table, "column": column},
+        ).scalar()
+        if data_type == "timestamp with time zone":
+            continue  # created by the baseline from the current models
+        # Anything that isn't a timestamp (e.g. an empty string) becomes NULL
+        connection.execute(
+            text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE TIMESTAMPTZ"
+                f" USING CASE WHEN {column} ~ '^[0-9]{{4}}-[0-9]{{2}}-[0-9]{{2}}' THEN {column}::timestamptz END"
+            )
+        )
+
+    for statement in (
+        # Prices are read by coin; the (exchange, coin) primary keys can't serve that
+        "CREATE INDEX IF NOT EXISTS ix_crypto_prices_coin_exchange ON crypto_prices (coin, exchange)",
+        "CREATE INDEX IF NOT EXISTS ix_stablecoin_prices_coin_exchange ON stablecoin_prices (coin, exchange)",
+        "CREATE INDEX IF NOT EXISTS ix_crypto_prices_last_updated ON crypto_prices (last_updated)",
+        "CREATE INDEX IF NOT EXISTS ix_stablecoin_prices_last_updated ON stablecoin_prices (last_updated)",
+        "CREATE INDEX IF NOT EXISTS ix_platform_info_active ON platform_info (id) WHERE is_active",
+    ):
+        connection.execute(text(statement))
+
+
+def _heartbeat_columns(connection: Connection) -> set[str]:
+    return set(
+        connection.execute(
+            text("SELECT column_name FROM information_schema.columns WHERE table_name = 'provider_heartbeat'")
+        ).scalars()
+    )
+
+
+def _key_heartbeats_by_coin(connection: Connection) -> None:
+    if _heartbeat_columns(connection) & {"coin", "coins"}:
+        return  # created by the baseline from a later model
+    # One heartbeat per exchange can't say which coins were reported: drop them.
+    # Until the next fetch run, prices report their own last_updated.
+    for statement in (
+        "DELETE FROM provider_heartbeat",
+        "ALTER TABLE provider_heartbeat ADD COLUMN coin VARCHAR NOT NULL",
+        "ALTER TABLE provider_heartbeat DROP CONSTRAINT provider_heartbeat_pkey",
+        "ALTER TABLE provider_heartbeat ADD PRIMARY KEY (exchange, coin)",
+        "ALTER TABLE provider_heartbeat DROP COLUMN IF EXISTS rows_reported",
+        "ALTER TABLE provider_heartbeat DROP COLUMN IF EXISTS rows_changed",
+    ):
+        connection.execute(text(statement))
+
+
+def _batch_heartbeats_per_provider(connection: Connection) -> None:
+    if "coins" in _heartbeat_columns(connection):
+        return  # created by the baseline from the current model
+    # Rows per (exchange, coin) can't be merged into one reliably: drop them,
+    # the next fetch run writes one row per provider
+    for statement in (
+        "DELETE FROM provider_heartbeat",
+        "ALTER TABLE provider_heartbeat DROP CONSTRAINT provider_heartbeat_pkey",
+        "ALTER TABLE provider_heartbeat DROP COLUMN coin",
+        "ALTER TABLE provider_heartbeat ADD PRIMARY KEY (exchange)",
+        "ALTER TABLE provider_heartbeat ADD COLUMN coins VARCHAR[] NOT NULL",
+    ):
+        connection.execute(text(statement))
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Baseline tables", _create_baseline_tables),
+    Migration(
+        2,
+        "Columns added to existing tables before versioned migrations",
+        [
+            "ALTER TABLE crypto_prices ADD COLUMN IF NOT EXISTS last_updated VARCHAR",
+            "ALTER TABLE stablecoin_prices ADD COLUMN IF NOT EXISTS last_updated VARCHAR",
+            "ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS website_url VARCHAR DEFAULT ''",
+            "ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS referral_url VARCHAR DEFAULT ''",
+            "ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS referral_code VARCHAR DEFAULT ''",
+            "ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS cta_label VARCHAR DEFAULT ''",
+            "ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS funding_en VARCHAR DEFAULT ''",
+            "ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS trading_en VARCHAR DEFAULT ''",
+            "ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS withdraw_en VARCHAR DEFAULT ''",
+            "ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS deposit_networks_en VARCHAR DEFAULT ''",
+            "ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS withdraw_networks_en VARCHAR DEFAULT ''",
+            "ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS logo_dark_url VARCHAR DEFAULT ''",
+        ],
+    ),
+    Migration(
+        3,
+        "data_version counter for cross-process cache invalidation",
+        [
+            "CREATE TABLE IF NOT EXISTS data_version (id INTEGER PRIMARY KEY, version BIGINT NOT NULL DEFAULT 0)",
+            "INSERT INTO data_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING",
+        ],
+    ),
+    Migration(4, "manual_price table, filled from platform_info.manual_prices", _create_manual_price_table),
+    Migration(5, "timestamptz price timestamps; coin-leading and partial indexes", _type_price_timestamps),
+    Migration(6, "provider_heartbeat keyed by (exchange, coin)", _key_heartbeats_by_coin),
+    Migration(7, "provider_heartbeat: one row per provider with its reported coins", _batch_heartbeats_per_provider),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+class SchemaOutOfDate(Exception):
+    """The database is behind the schema version this code expects."""
+
+
+# ── Version check (API and fetcher) ───────────────────────────────────────────
+
+# Only cached once the database is current, so a process started before a
+# migration notices it as soon as it has been applied.
+_verified_version: Optional[int] = None
+
+
+def read_schema_version(connection: Connection) -> int:
+    """Highest applied version, or 0 for a database that predates migrations."""
+    try:
+        return connection.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_version")).scalar()
+    except ProgrammingError:  # schema_version doesn't exist yet
+        connection.rollback()
+        return 0
+
+
+def schema_version() -> int:
+    """Current database version; a single query per process once it is up to date."""
+    global _verified_version
+    if _verified_version == LATEST_VERSION:
+        return _verified_version
+    with engine.connect() as connection:
+        version = read_schema_version(connection)
+    if version == LATEST_VERSION:
+        _verified_version = version
+    return version
+
+
+def ensure_schema_current() -> None:
+    """Raise SchemaOutOfDate unless every migration has been applied."""
+    version = schema_version()
+    if version < LATEST_VERSION:
+        raise SchemaOutOfDate(
+            f"Database schema is at version {version}, this code needs {LATEST_VERSION}. "
+            "Run: python migrate.py"
+        )
+
+
+def check_schema_version() -> None:
+    """Startup hook: log (don't fail) when migrations are pending."""
+    try:
+        ensure_schema_current()
+    except SchemaOutOfDate as exc:
+        logger.error("%s", exc)
+
+
+# ── Applying migrations (explicit command only) ───────────────────────────────
+
+def print_status() -> None:
+    with engine.connect() as connection:
+        current = read_schema_version(connection)
+    print(f"Database schema version: {current} (latest: {LATEST_VERSION})")
+    for migration in MIGRATIONS:
+        if migration.version > current:
+            print(f"  pending {migration.version}: {migration.description}")
+
+
+def run_migrations() -> int:
+    """
+    Apply every pending migration, in order, and return the resulting version.
+    Everything runs in one transaction under an advisory lock: a failing
+    migration leaves the database untouched.
+    """
+    with engine.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        connection.execute(text("SET LOCAL statement_timeout = 0"))  # DDL may outlast DB_STATEMENT_TIMEOUT_MS
+        connection.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_version ("
+                " version INTEGER PRIMARY KEY,"
+                " description VARCHAR NOT NULL,"
+                " applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+        )
+        current = read_schema_version(connection)
+        for migration in MIGRATIONS:
+            if migration.version <= current:
+                continue
+            print(f"⏳ Applying migration {migration.version}: {migration.description}")
+            if callable(migration.steps):
+                migration.steps(connection)
+            else:
+                for statement in migration.steps:
+                    connection.execute(text(statement))
+            connection.execute(
+                text("INSERT INTO schema_version (version, description) VALUES (:version, :description)"),
+                {"version": migration.version, "description": migration.description},
+            )
+            current = migration.version
+    print(f"✅ Database schema at version {current}.")
+    return current
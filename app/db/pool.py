@@ -0,0 +1,160 @@
+"""
+pool.py — Connection pool selection and pool metrics for app.db.session.engine.
+
+DB_POOL_MODE picks the pool:
+  - "queue" → a bounded QueuePool per process, for long-lived workers.
+  - "null"  → no pooling: every checkout opens a connection and check-in closes
+              it. Default on serverless, where each instance holding a pool of
+              idle connections exhausts Postgres under bursty traffic. Pair it
+              with an external pooler (DB_PGBOUNCER) in front of Postgres.
+
+Both are wrapped to record checkout latency and connection counts, served by
+GET /api/health/db (behind the cron secret). The async engine (asyncpg, used by the read routes) gets
+the same pool settings and its own metrics.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.core.config import settings
+
+LATENCY_WINDOW = 500  # checkout latencies kept for the percentiles
+
+
+class PoolMetrics:
+    """Counters and recent checkout latencies, updated from any thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.checkouts = 0
+        self.checkout_errors = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.invalidated = 0
+        self.checked_out = 0
+
+    def record_checkout(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.checkouts += 1
+                self.checked_out += 1
+                self.latencies.append(seconds)
+            else:
+                self.checkout_errors += 1
+
+    def count(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self.latencies)
+            checkouts, errors = self.checkouts, self.checkout_errors
+            opened, closed, invalidated = self.connections_opened, self.connections_closed, self.invalidated
+            checked_out = self.checked_out
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 2)
+
+        return {
+            "checkouts": checkouts,
+            "checkout_errors": errors,
+            "checked_out": checked_out,
+            "connections_opened": opened,
+            "connections_closed": closed,
+            "connections_open": opened - closed,
+            "invalidated": invalidated,
+            "checkout_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)},
+        }
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class _TimedPoolMixin:
+    """Times Pool.connect(), i.e. how long a caller waits for a connection."""
+
+    metrics = pool_metrics
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except Exception:
+            self.metrics.record_checkout(time.perf_counter() - started, ok=False)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, ok=True)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedNullPool(_TimedPoolMixin, NullPool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
+
+
+class TimedAsyncNullPool(_TimedPoolMixin, NullPool):
+    metrics = async_pool_metrics
+
+
+def engine_options() -> dict[str, Any]:
+    """create_engine() keyword arguments for the configured DB_POOL_MODE."""
+    connect_args: dict[str, Any] = {"connect_timeout": settings.db_connect_timeout_seconds}
+    if not settings.db_pgbouncer:
+        # PgBouncer rejects the "options" startup parameter; behind it, set the
+        # timeout on the role instead (ALTER ROLE … SET statement_timeout = …).
+        connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+
+    return _pool_options(connect_args, TimedNullPool, TimedQueuePool)
+
+
+def async_engine_options() -> dict[str, Any]:
+    """create_async_engine() keyword arguments: the same pool, asyncpg's connect arguments."""
+    connect_args: dict[str, Any] = {"timeout": settings.db_connect_timeout_seconds}
+    if settings.db_pgbouncer:
+        # Transaction-mode PgBouncer hands each transaction a different server
+        # connection, so asyncpg's prepared statements can't be reused.
+        connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+    else:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+    return _pool_options(connect_args, TimedAsyncNullPool, TimedAsyncQueuePool)
+
+
+def _pool_options(connect_args: dict[str, Any], null_pool: type, queue_pool: type) -> dict[str, Any]:
+    options: dict[str, Any] = {"connect_args": connect_args}
+    if settings.db_pool_mode == "null":
+        options["poolclass"] = null_pool
+    else:
+        options.update(
+            poolclass=queue_pool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    return options
+
+
+def install_pool_events(pool: Pool, metrics: PoolMetrics = pool_metrics) -> None:
+    """Count connections opened, closed, invalidated and checked back in."""
+    event.listen(pool, "connect", lambda *_args: metrics.count("connections_opened"))
+    event.listen(pool, "close", lambda *_args: metrics.count("connections_closed"))
+    event.listen(pool, "close_detached", lambda *_args: metrics.count("connections_closed"))
+    event.listen(pool, "invalidate", lambda *_args: metrics.count("invalidated"))
+    event.listen(pool, "checkin", lambda *_args: metrics.count("checked_out", -1))
@@ -1,10 +1,29 @@
-from sqlalchemy import text
-from sqlmodel import Session, SQLModel, create_engine
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import models  # noqa: F401
 from app.core.config import settings
+from app.db.pool import async_engine_options, async_pool_metrics, engine_options, install_pool_events
+
+# Pool mode, timeouts and PgBouncer compatibility: see app/db/pool.py
+engine = create_engine(settings.database_url, **engine_options())
+install_pool_events(engine.pool)
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+# Read routes run as coroutines on this asyncpg engine instead of taking a
+# thread from Starlette's pool per request. Scripts, the fetcher and admin
+# writes keep the sync engine above.
+_async_engine: Optional[AsyncEngine] = None
+
+# Background DB work from async code (fetcher writes, fetch job bookkeeping) runs
+# on this one thread: the sync driver never blocks the event loop, request
+# handlers keep the default thread pool to themselves, and writes stay in order.
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
 
 
 def get_session():
@@ -12,18 +31,21 @@ def get_session():
         yield session
 
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
-    with engine.begin() as connection:
-        connection.execute(text("ALTER TABLE crypto_prices ADD COLUMN IF NOT EXISTS last_updated VARCHAR"))
-        connection.execute(text("ALTER TABLE stablecoin_prices ADD COLUMN IF NOT EXISTS last_updated VARCHAR"))
-        connection.execute(text("ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS website_url VARCHAR DEFAULT ''"))
-        connection.execute(text("ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS referral_url VARCHAR DEFAULT ''"))
-        connection.execute(text("ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS referral_code VARCHAR DEFAULT ''"))
-        connection.execute(text("ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS cta_label VARCHAR DEFAULT ''"))
-        connection.execute(text("ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS funding_en VARCHAR DEFAULT ''"))
-        connection.execute(text("ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS trading_en VARCHAR DEFAULT ''"))
-        connection.execute(text("ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS withdraw_en VARCHAR DEFAULT ''"))
-        connection.execute(text("ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS deposit_networks_en VARCHAR DEFAULT ''"))
-        connection.execute(text("ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS withdraw_networks_en VARCHAR DEFAULT ''"))
-        connection.execute(text("ALTER TABLE platform_info ADD COLUMN IF NOT EXISTS logo_dark_url VARCHAR DEFAULT ''"))
+def get_async_engine() -> AsyncEngine:
+    """The asyncpg engine, created on first use: processes that never serve a read don't load asyncpg."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(settings.async_database_url, **async_engine_options())
+        install_pool_events(_async_engine.pool, async_pool_metrics)
+    return _async_engine
+
+
+async def get_async_session():
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+async def run_in_db_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Await func(*args, **kwargs) run on the background DB thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, partial(func, *args, **kwargs))
@@ -14,18 +14,40 @@ Entry point: run_fetcher() → called by `python -m app.fetcher` or GitHub Actio
 """
 
 import asyncio
+import contextlib
 import datetime
-from dataclasses import asdict, dataclass, replace
-from typing import Any, Iterable, Optional
+import inspect
+import itertools
+import json
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field, replace
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
 
 import httpx
 from dotenv import load_dotenv
+from sqlalchemy import or_
 from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import Session
 
 from app.core.config import settings
-from app.db.session import create_db_and_tables, engine
-from app.models import CryptoPrice, StablecoinPrice
+from app.db.migrations import ensure_schema_current
+from app.db.session import engine, run_in_db_thread
+from app.models import CryptoPrice, ProviderHeartbeat, StablecoinPrice
+from app.services.discovery_cache import CatalogueEntry, get_discovery_store
+from app.services.data_version import bump_data_version, data_changed
+from app.services.pricing import format_timestamp
+from app.services.resilience import (
+    RETRYABLE_STATUS_CODES,
+    CircuitOpen,
+    ProviderHealth,
+    backoff_delay,
+    get_provider_health,
+    is_retryable_error,
+    provider_health_snapshot,
+)
 
 load_dotenv()  # Load DB credentials and tokens from .env file
 
@@ -94,7 +116,7 @@ class PriceRecord:
       direct_cop   — True if the exchange quoted the coin directly in COP,
                      False if it was quoted in USD and we converted via a bridge
       usd_bridge   — Which stable coin was used as bridge (e.g. "usdt"), empty if direct
-      last_updated — UTC timestamp string set in collect_prices()
+      last_updated — UTC timestamp set in collect_prices()
     """
     exchange: str
     coin: str
@@ -105,12 +127,81 @@ class PriceRecord:
     spread: float = 0.0
     direct_cop: bool = True
     usd_bridge: str = ""
-    last_updated: str = ""
+    last_updated: Optional[datetime.datetime] = None
 
     def as_db_dict(self) -> dict[str, Any]:
         """Convert this dataclass to a plain dict for SQL insertion."""
         return asdict(self)
 
+    @property
+    def key(self) -> tuple[str, str]:
+        """Primary key of the row this record writes: (exchange, coin)."""
+        return self.exchange, self.coin
+
+
+# Columns that define "the price moved". last_updated is deliberately left out:
+# a row is only rewritten when one of these changes.
+PRICE_FIELDS = ("buy_cop", "sell_cop", "buy_usd", "sell_usd", "spread", "direct_cop", "usd_bridge")
+
+
+@dataclass
+class UpsertResult:
+    """
+    Outcome of upsert_prices().
+
+      changed_keys — (exchange, coin) pairs that were inserted or updated
+      unchanged    — how many records were skipped because the price didn't move
+    """
+    changed_keys: set[tuple[str, str]] = field(default_factory=set)
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> int:
+        return len(self.changed_keys)
+
+    @property
+    def total(self) -> int:
+        return self.changed + self.unchanged
+
+
+@dataclass
+class FetchSummary:
+    """
+    What happened during one run_fetcher() call. Printed at the end of the run
+    and returned to the caller (e.g. the cron route) as a plain dict via as_dict().
+    """
+    refreshed_at: str = ""
+    collected: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    provider_rows: dict[str, int] = field(default_factory=dict)
+    request_cache_hits: int = 0
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    cut_off: list[str] = field(default_factory=list)
+    breakers: dict[str, dict[str, Any]] = field(default_factory=dict)
+    providers: dict[str, str] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def provider_outcomes(self) -> dict[str, str]:
+        """
+        One word per provider: "cut_off" (stopped by the time budget, rows
+        discarded), "ok" (rows collected), "circuit_open" (skipped by its
+        breaker) or "no_data".
+        """
+        outcomes = {}
+        for provider in PROVIDERS:
+            if provider in self.cut_off:
+                outcomes[provider] = "cut_off"
+            elif self.provider_rows.get(provider):
+                outcomes[provider] = "ok"
+            elif self.breakers.get(provider, {}).get("state") == "open":
+                outcomes[provider] = "circuit_open"
+            else:
+                outcomes[provider] = "no_data"
+        return outcomes
+
 
 # ── Pure helper functions ─────────────────────────────────────────────────────
 
@@ -148,7 +239,7 @@ def build_price_record(
     sell_usd: float = 0.0,
     direct_cop: bool = True,
     usd_bridge: str = "",
-    last_updated: str = "",
+    last_updated: Optional[datetime.datetime] = None,
 ) -> PriceRecord:
     """
     Normalize and assemble a PriceRecord.
@@ -182,42 +273,205 @@ def get_price_model(coin: str):
     return StablecoinPrice if coin.lower() in STABLE_COINS else CryptoPrice
 
 
-def upsert_price(session: Session, record: PriceRecord) -> None:
+def upsert_prices(session: Session, records: Iterable[PriceRecord]) -> UpsertResult:
     """
-    Insert a price row, or update it if (exchange, coin) already exists.
-    This is a PostgreSQL-specific "INSERT ... ON CONFLICT DO UPDATE" (upsert).
+    Upsert the records whose price moved, with one statement per table.
 
-    The primary key is the pair (exchange, coin), e.g. ("binance", "btc").
-    All other columns (buy_cop, sell_cop, spread, last_updated, …) are overwritten.
-    """
-    model = get_price_model(record.coin)
-    payload = record.as_db_dict()
+    Records are grouped by target model (CryptoPrice / StablecoinPrice) and each
+    group is sent as a single multi-row statement:
 
-    statement = insert(model).values(payload)
+      INSERT INTO crypto_prices (...) VALUES (...), (...), ...
+      ON CONFLICT (exchange, coin) DO UPDATE SET buy_cop = EXCLUDED.buy_cop, ...
+      WHERE crypto_prices.buy_cop IS DISTINCT FROM EXCLUDED.buy_cop OR ...
+      RETURNING exchange, coin
 
-    # Build the SET clause: update every column except the primary key columns
-    update_fields = {
-        column: payload[column]
-        for column in payload
-        if column not in {"exchange", "coin"}  # these are the PK, never update them
-    }
+    The WHERE clause turns "same price, new timestamp" into a no-op, so those rows
+    produce no dead tuples or WAL. RETURNING reports which rows were actually
+    inserted or updated. Every record is sent: the comparison is against what
+    the database holds now, whichever process or instance wrote it.
+
+    Postgres rejects a multi-row upsert that touches the same key twice, so
+    duplicates are collapsed first; the last record wins.
+    """
+    result = UpsertResult()
+    grouped: dict[Any, dict[tuple[str, str], dict[str, Any]]] = {}
+    for record in records:
+        grouped.setdefault(get_price_model(record.coin), {})[record.key] = record.as_db_dict()
+
+    for model, rows in grouped.items():
+        table = model.__table__
+        statement = insert(model).values(list(rows.values()))
+        update_columns = {
+            column.name: statement.excluded[column.name]
+            for column in table.columns
+            if column.name not in {"exchange", "coin"}  # PK columns, never updated
+        }
+        statement = statement.on_conflict_do_update(
+            index_elements=["exchange", "coin"],
+            set_=update_columns,
+            where=or_(*(table.c[name].is_distinct_from(statement.excluded[name]) for name in PRICE_FIELDS)),
+        ).returning(table.c.exchange, table.c.coin)
+        written = {(exchange, coin) for exchange, coin in session.exec(statement)}
+        result.changed_keys |= written
+        result.unchanged += len(rows) - len(written)
+
+    return result
+
+
+def record_heartbeats(session: Session, records: Iterable[PriceRecord]) -> None:
+    """
+    Upsert one provider_heartbeat row per provider that reported this run:
+    the coins it reported, and the run's timestamp (collect_prices() stamps
+    every record with it).
+
+    This is how freshness is recorded now that unchanged price rows keep their
+    old last_updated: one narrow row per provider, in a single statement,
+    instead of rewriting every wide price row. A coin the provider didn't
+    report this time drops out of its row, so that price shows as stale.
+    """
+    coins: dict[str, set[str]] = {}
+    last_checked: dict[str, Optional[datetime.datetime]] = {}
+    for record in records:
+        coins.setdefault(record.exchange, set()).add(record.coin)
+        last_checked[record.exchange] = record.last_updated
+    if not coins:
+        return
+
+    statement = insert(ProviderHeartbeat).values([
+        {"exchange": exchange, "coins": sorted(reported), "last_checked": last_checked[exchange]}
+        for exchange, reported in coins.items()
+    ])
     statement = statement.on_conflict_do_update(
-        index_elements=["exchange", "coin"],  # conflict target = primary key
-        set_=update_fields,
+        index_elements=["exchange"],
+        set_={"coins": statement.excluded.coins, "last_checked": statement.excluded.last_checked},
     )
     session.exec(statement)
 
 
-def upsert_prices(session: Session, records: Iterable[PriceRecord]) -> int:
-    """Run upsert_price for every record and return how many were processed."""
-    count = 0
-    for record in records:
-        upsert_price(session, record)
-        count += 1
-    return count
+# ── HTTP helper ───────────────────────────────────────────────────────────────
 
+# Upper bound for any single request; a run deadline can only shorten it.
+REQUEST_TIMEOUT_SECONDS = 10.0
+
+class RequestCache:
+    """
+    Per-run memo of request_json() results.
+
+    Within one run the same URL is often wanted by several stages (e.g. the
+    Bitso usdt_cop ticker is both a bridge rate and a price, and Buda's usdt-cop
+    ticker is fetched by the bridge and the price stage at the same time).
+    The first caller starts the request; everyone else with the same
+    method + URL + body awaits that same in-flight task, or gets its finished
+    result. Results are shared, so callers must treat them as read-only.
+
+    The cache lives only for one collect_prices() call (see FetchRun), so
+    nothing is ever served across runs.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[tuple[str, str, str], "asyncio.Task[Optional[Any]]"] = {}
+        self.hits = 0
+
+    def cancel_pending(self) -> None:
+        """Cancel requests nobody is waiting for any more (e.g. after a deadline)."""
+        for task in self._tasks.values():
+            task.cancel()
+
+    @staticmethod
+    def make_key(method: str, url: str, kwargs: dict[str, Any]) -> tuple[str, str, str]:
+        """Key on method, URL and whatever else shapes the request (body, params)."""
+        body = json.dumps(kwargs, sort_keys=True, default=str) if kwargs else ""
+        return method.upper(), url, body
+
+    async def get_or_request(self, key: tuple[str, str, str], request: Callable[[], Any]) -> Optional[Any]:
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(request())
+        else:
+            self.hits += 1
+        # shield(): a cancelled waiter must not cancel the request other stages share
+        return await asyncio.shield(task)
+
+
+class DeadlineExceeded(Exception):
+    """Raised instead of sending a request once the run's time budget is spent."""
+
+
+_run_ids = itertools.count(1)
+
+
+class FetchRun:
+    """
+    State shared by every request of one collect_prices() call:
+
+      id         — counts the run's failures once per provider (see resilience.py)
+      cache      — the run's RequestCache
+      host_limit — at most FETCH_HOST_CONCURRENCY requests in flight per host,
+                   so per-market providers (Buda, Bitso) can fan out without
+                   tripping the exchange's rate limits
+      deadline   — event-loop time after which no request may still be running
+    """
+
+    def __init__(self, host_concurrency: int, deadline: Optional[float] = None) -> None:
+        self.id = next(_run_ids)
+        self.cache = RequestCache()
+        self.host_concurrency = max(1, host_concurrency)
+        self.deadline = deadline
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def request_timeout(self) -> float:
+        """
+        Timeout for the next request: REQUEST_TIMEOUT_SECONDS, capped by the time
+        left before the deadline. Raises DeadlineExceeded when none is left.
+        """
+        if self.deadline is None:
+            return REQUEST_TIMEOUT_SECONDS
+        remaining = self.deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise DeadlineExceeded("fetch run time budget exhausted")
+        return min(REQUEST_TIMEOUT_SECONDS, remaining)
+
+    def host_limit(self, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).host
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.host_concurrency)
+        return self._host_semaphores[host]
+
+
+# The FetchRun in progress. collect_prices() sets it; the stage tasks it
+# creates inherit it automatically through their context. Outside a run
+# (e.g. calling a fetch_* function directly) requests are neither cached nor limited.
+_current_run: ContextVar[Optional[FetchRun]] = ContextVar("current_fetch_run", default=None)
+
+
+def _allow_request(health: ProviderHealth) -> bool:
+    """Whether the provider's breaker lets a request through (one probe per run when half-open)."""
+    run = _current_run.get()
+    return health.allow_request(run.id if run else None)
+
+
+def _record_failure(health: ProviderHealth) -> None:
+    """A failed request, counted once per provider per run."""
+    run = _current_run.get()
+    health.record_failure(run.id if run else None)
+
+
+def _request_timeout() -> float:
+    """Per-request timeout for the current run (see FetchRun.request_timeout)."""
+    run = _current_run.get()
+    return run.request_timeout() if run else REQUEST_TIMEOUT_SECONDS
+
+
+@contextlib.asynccontextmanager
+async def _host_slot(url: str) -> AsyncIterator[None]:
+    """Hold one of the run's per-host request slots while the body runs."""
+    run = _current_run.get()
+    if run is None:
+        yield
+        return
+    async with run.host_limit(url):
+        yield
 
-# ── HTTP helper ───────────────────────────────────────────────────────────────
 
 async def request_json(
     client: httpx.AsyncClient,
@@ -233,9 +487,100 @@ async def request_json(
     so that individual exchange failures don't crash the whole run.
 
     Extra keyword args (**kwargs) are passed through to httpx, e.g. `json=` for POST bodies.
+    Inside a fetch run, identical requests are coalesced through the run's RequestCache.
+    """
+    run = _current_run.get()
+    if run is None:
+        return await _send_json(client, url, method=method, exchange=exchange, **kwargs)
+    return await run.cache.get_or_request(
+        RequestCache.make_key(method, url, kwargs),
+        lambda: _send_json(client, url, method=method, exchange=exchange, **kwargs),
+    )
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    method: str,
+    exchange: str,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    Send one request on behalf of `exchange` and return the raw response.
+    Exceptions propagate; every outbound call except the streamed Binance dump
+    goes through here, so this is where the per-provider resilience lives
+    (see app/services/resilience.py):
+
+      - While the provider's circuit breaker is open, CircuitOpen is raised
+        without sending anything; half-open, only the run's first request
+        (the probe) is sent.
+      - The timeout is the provider's adaptive timeout (a multiple of its recent
+        p95 latency), capped by the time left in the run.
+      - Idempotent GETs (other than a half-open probe) are retried up to
+        FETCH_MAX_RETRIES times on timeouts, connection errors, 429 and 5xx,
+        with jittered exponential backoff, as long as the run deadline leaves
+        room for the wait.
+
+    The breaker counts at most one failure per provider per run, however many
+    requests or attempts failed.
+    """
+    health = get_provider_health(exchange)
+    probe = health.state == "half_open"
+    if not _allow_request(health):
+        raise CircuitOpen(f"circuit open for {exchange}; skipping request")
+
+    # A half-open probe is not retried: one failure is enough to open the breaker again
+    attempts = 1 + (settings.fetch_max_retries if method.upper() == "GET" and not probe else 0)
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        try:
+            async with _host_slot(url):
+                # Computed after getting a slot: waiting for one uses up the budget too
+                timeout = health.timeout(_request_timeout())
+                started = time.perf_counter()
+                response = await client.request(method, url, timeout=timeout, **kwargs)
+        except DeadlineExceeded:
+            raise
+        except Exception as exc:
+            if not last_attempt and is_retryable_error(exc) and await _backoff(attempt):
+                continue
+            _record_failure(health)
+            raise
+
+        if response.status_code not in RETRYABLE_STATUS_CODES:
+            health.record_success(time.perf_counter() - started)
+            return response
+        if not last_attempt and await _backoff(attempt, response.headers.get("Retry-After")):
+            continue
+        _record_failure(health)
+        return response  # the caller's raise_for_status() reports it
+
+
+async def _backoff(attempt: int, retry_after: Optional[str] = None) -> bool:
+    """
+    Sleep before retry number `attempt`. Returns False (without sleeping) when
+    the wait would run past the run deadline, i.e. the retry isn't worth it.
     """
+    delay = backoff_delay(attempt, retry_after)
+    run = _current_run.get()
+    if run and run.deadline is not None and asyncio.get_running_loop().time() + delay >= run.deadline:
+        return False
+    await asyncio.sleep(delay)
+    return True
+
+
+async def _send_json(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    method: str,
+    exchange: str,
+    **kwargs: Any,
+) -> Optional[Any]:
+    """The actual request behind request_json(), without any caching."""
     try:
-        response = await client.request(method, url, **kwargs)
+        response = await _send(client, url, method=method, exchange=exchange, **kwargs)
         response.raise_for_status()  # raises if status >= 400
         return response.json()
     except Exception as exc:
@@ -243,9 +588,138 @@ async def request_json(
         return None
 
 
+async def fetch_catalogue(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    exchange: str,
+    key: str,
+    parse: Callable[[Any], Any],
+) -> Optional[Any]:
+    """
+    Return a market catalogue through the cross-run discovery cache.
+
+      - Cached entry younger than DISCOVERY_CACHE_TTL_SECONDS → returned, no request.
+      - Otherwise the URL is re-requested, conditionally (If-None-Match /
+        If-Modified-Since) when the exchange sent validators last time.
+        304 → the cached entry is just marked fresh again.
+        200 → `parse(json_body)` is cached and returned.
+      - If the refresh fails, the last-known catalogue is used instead.
+
+    `parse` must return something JSON-serializable (e.g. a sorted list of names).
+    Returns None only when there is neither a response nor a cached entry.
+    """
+    entry = await _load_catalogue(key, exchange=exchange)
+    if entry and entry.is_fresh(settings.discovery_cache_ttl_seconds):
+        return entry.payload
+
+    headers = {}
+    if entry and entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry and entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+
+    try:
+        response = await _send(client, url, method="GET", exchange=exchange, headers=headers)
+        if response.status_code == 304 and entry:
+            entry.fetched_at = time.time()
+        else:
+            response.raise_for_status()
+            payload = parse(response.json())
+            if not payload:
+                raise ValueError("empty catalogue")
+            entry = CatalogueEntry(
+                key=key,
+                payload=payload,
+                etag=response.headers.get("ETag", ""),
+                last_modified=response.headers.get("Last-Modified", ""),
+                fetched_at=time.time(),
+            )
+    except Exception as exc:
+        if not entry:
+            print(f"⚠️ {exchange}: request failed for {url}: {exc}")
+            return None
+        print(f"⚠️ {exchange}: refresh failed for {url} ({exc}); using last-known catalogue.")
+        return entry.payload
+
+    await _save_catalogue(entry, exchange=exchange)
+    return entry.payload
+
+
+async def _load_catalogue(key: str, *, exchange: str) -> Optional[CatalogueEntry]:
+    """Read a discovery cache entry off the event loop; None if missing or unreadable."""
+    try:
+        return await asyncio.to_thread(get_discovery_store().load, key)
+    except Exception as exc:
+        print(f"⚠️ {exchange}: discovery cache unavailable for {key}: {exc}")
+        return None
+
+
+async def _save_catalogue(entry: CatalogueEntry, *, exchange: str) -> None:
+    """Write a discovery cache entry off the event loop; failures are only logged."""
+    try:
+        await asyncio.to_thread(get_discovery_store().save, entry)
+    except Exception as exc:
+        print(f"⚠️ {exchange}: could not store discovery cache for {entry.key}: {exc}")
+
+
+async def stream_filtered_objects(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    exchange: str,
+    field: str,
+    wanted: set[str],
+) -> Optional[list[dict[str, Any]]]:
+    """
+    Download a JSON array of flat objects and return only the objects whose
+    string `field` is in `wanted`, scanning the body as it streams in.
+
+    Used for payloads where we need a handful of entries out of thousands: a
+    single regex finds the matching objects in each chunk and only those are
+    json-decoded, so the full body is never held in memory or turned into
+    Python objects. Objects must not contain nested objects (true for
+    Binance's bookTicker). Returns None on any error, like request_json().
+    """
+    values = "|".join(re.escape(value) for value in sorted(wanted))
+    matching_object = re.compile(
+        r'\{[^{}]*"%s"\s*:\s*"(?:%s)"[^{}]*\}' % (re.escape(field), values or "(?!)")
+    )
+    kept: list[dict[str, Any]] = []
+    buffer = ""
+    health = get_provider_health(exchange)
+    try:
+        if not _allow_request(health):
+            raise CircuitOpen(f"circuit open for {exchange}; skipping request")
+        async with _host_slot(url), client.stream("GET", url, timeout=_request_timeout()) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_text():
+                buffer += chunk
+                # Everything up to the last "}" is made of complete objects
+                complete = buffer.rfind("}") + 1
+                kept.extend(
+                    json.loads(match.group())
+                    for match in matching_object.finditer(buffer, 0, complete)
+                )
+                buffer = buffer[complete:]
+        if buffer.replace(",", "").strip() not in ("]", "[]"):
+            raise ValueError("truncated or malformed JSON array")
+        # A full dump is much slower than a normal request: don't let it skew
+        # the adaptive timeout, just mark the provider as reachable.
+        health.record_success()
+        return kept
+    except Exception as exc:
+        if not isinstance(exc, (CircuitOpen, DeadlineExceeded)):
+            _record_failure(health)
+        print(f"⚠️ {exchange}: request failed for {url}: {exc}")
+        return None
+
+
 # ── Available market discovery ────────────────────────────────────────────────
 # Before fetching prices, we ask each exchange what markets it actually supports.
 # This avoids 404 errors and lets us skip unsupported coins gracefully.
+# The answers go through fetch_catalogue(), so they are only re-downloaded once
+# the cached copy is older than DISCOVERY_CACHE_TTL_SECONDS.
 
 async def fetch_bitso_available_books(client: httpx.AsyncClient) -> set[str]:
     """
@@ -267,14 +741,14 @@ async def fetch_bitso_available_books(client: httpx.AsyncClient) -> set[str]:
     Returns a set of lowercase book names, e.g. {"btc_cop", "usdt_cop", "eth_mxn", ...}
     Book names follow the pattern "{base}_{quote}", e.g. "btc_cop" = BTC quoted in COP.
     """
-    data = await request_json(
+    books = await fetch_catalogue(
         client,
         "https://api.bitso.com/v3/available_books/",
         exchange="bitso",
+        key="bitso_books",
+        parse=lambda data: sorted({item.get("book", "").lower() for item in data.get("payload", [])}),
     )
-    if not data:
-        return set()
-    return {item.get("book", "").lower() for item in data.get("payload", [])}
+    return set(books or [])
 
 
 async def fetch_buda_available_markets(client: httpx.AsyncClient) -> set[str]:
@@ -296,25 +770,31 @@ async def fetch_buda_available_markets(client: httpx.AsyncClient) -> set[str]:
     Returns a set of lowercase market names, e.g. {"btc-cop", "eth-cop", "usdt-cop", ...}
     Buda uses dashes: "btc-cop" (vs Bitso which uses underscores: "btc_cop").
     """
-    data = await request_json(
+    markets = await fetch_catalogue(
         client,
         "https://www.buda.com/api/v2/markets",
         exchange="buda",
+        key="buda_markets",
+        parse=lambda data: sorted({item.get("name", "").lower() for item in data.get("markets", [])}),
     )
-    if not data:
-        return set()
-    return {item.get("name", "").lower() for item in data.get("markets", [])}
+    return set(markets or [])
 
 
 # ── Bridge rate fetching ──────────────────────────────────────────────────────
 # Bridge rates are the USDT/COP (or USDC/COP) prices fetched from each exchange.
 # They are used later to convert any USD-quoted price into COP.
 
-async def fetch_bitso_bridge_rates(client: httpx.AsyncClient) -> dict[str, BridgeRate]:
+async def fetch_bitso_bridge_rates(
+    client: httpx.AsyncClient,
+    available_books: Optional[set[str]] = None,
+) -> dict[str, BridgeRate]:
     """
     Fetch the COP price for each stable coin on Bitso (USDT, USDC, USD).
     These become the bridge rates used to convert BTC/USDT → BTC/COP, etc.
 
+    `available_books` is the result of fetch_bitso_available_books(); pass it in
+    when the caller already has it so the book list isn't downloaded twice.
+
     API: GET https://api.bitso.com/v3/ticker/?book=usdt_cop
 
     Example response:
@@ -331,20 +811,22 @@ async def fetch_bitso_bridge_rates(client: httpx.AsyncClient) -> dict[str, Bridg
 
     Returns a dict like: {"usdt": BridgeRate(coin="usdt", buy=4160.5, sell=4139.8), ...}
     """
-    available_books = await fetch_bitso_available_books(client)
+    if available_books is None:
+        available_books = await fetch_bitso_available_books(client)
     bridges: dict[str, BridgeRate] = {}
 
-    for bridge in BITSO_BRIDGES:  # tries "usdt", "usdc", "usd" in order
-        book = f"{bridge}_cop"
-        # Skip if this stable coin isn't traded on Bitso
-        if available_books and book not in available_books:
-            continue
+    # Skip stable coins that aren't traded on Bitso
+    candidates = [
+        bridge for bridge in BITSO_BRIDGES  # "usdt", "usdc", "usd" in order
+        if not available_books or f"{bridge}_cop" in available_books
+    ]
+    # All tickers are requested concurrently; results are handled in BITSO_BRIDGES order
+    responses = await asyncio.gather(*[
+        request_json(client, f"https://api.bitso.com/v3/ticker/?book={bridge}_cop", exchange="bitso")
+        for bridge in candidates
+    ])
 
-        data = await request_json(
-            client,
-            f"https://api.bitso.com/v3/ticker/?book={book}",
-            exchange="bitso",
-        )
+    for bridge, data in zip(candidates, responses):
         if not data or not data.get("success"):
             continue
 
@@ -359,9 +841,13 @@ async def fetch_bitso_bridge_rates(client: httpx.AsyncClient) -> dict[str, Bridg
     return bridges
 
 
-async def fetch_buda_bridge_rates(client: httpx.AsyncClient) -> dict[str, BridgeRate]:
+async def fetch_buda_bridge_rates(
+    client: httpx.AsyncClient,
+    available_markets: Optional[set[str]] = None,
+) -> dict[str, BridgeRate]:
     """
     Fetch the COP price for each stable coin on Buda (USDT, USDC, EUROC).
+    Like the Bitso version, it reuses `available_markets` when the caller has it.
 
     API: GET https://www.buda.com/api/v2/markets/usdt-cop/ticker
 
@@ -379,19 +865,20 @@ async def fetch_buda_bridge_rates(client: httpx.AsyncClient) -> dict[str, Bridge
     Note: prices come as [value, currency] arrays, so we take index [0].
     Returns a dict like: {"usdt": BridgeRate(coin="usdt", buy=4161.0, sell=4140.0), ...}
     """
-    available_markets = await fetch_buda_available_markets(client)
+    if available_markets is None:
+        available_markets = await fetch_buda_available_markets(client)
     bridges: dict[str, BridgeRate] = {}
 
-    for bridge in STABLE_COINS:
-        market = f"{bridge}-cop"
-        if available_markets and market not in available_markets:
-            continue
+    candidates = [
+        bridge for bridge in STABLE_COINS
+        if not available_markets or f"{bridge}-cop" in available_markets
+    ]
+    responses = await asyncio.gather(*[
+        request_json(client, f"https://www.buda.com/api/v2/markets/{bridge}-cop/ticker", exchange="buda")
+        for bridge in candidates
+    ])
 
-        data = await request_json(
-            client,
-            f"https://www.buda.com/api/v2/markets/{market}/ticker",
-            exchange="buda",
-        )
+    for bridge, data in zip(candidates, responses):
         ticker = (data or {}).get("ticker", {})
         min_ask = ticker.get("min_ask") or []  # e.g. ["4161.00", "COP"]
         max_bid = ticker.get("max_bid") or []  # e.g. ["4140.00", "COP"]
@@ -682,15 +1169,35 @@ def select_cryptomkt_market(
 
 # ── Exchange price fetchers ───────────────────────────────────────────────────
 
-async def fetch_binance_prices(
-    client: httpx.AsyncClient,
-    reference_bridge: BridgeRate,
-) -> list[PriceRecord]:
+BINANCE_BOOK_TICKER_URL = "https://api.binance.com/api/v3/ticker/bookTicker"
+
+
+def binance_candidate_symbols() -> list[str]:
+    """
+    Every Binance symbol select_binance_symbol() could pick for TARGET_COINS:
+    each coin against each BINANCE_QUOTE_PRIORITY quote, plus the BINANCE_SYMBOLS aliases.
+    Most of them don't exist on Binance; fetch_binance_tickers() learns which do.
+    """
+    symbols = [f"{coin.upper()}{quote}" for coin in TARGET_COINS for quote in BINANCE_QUOTE_PRIORITY]
+    symbols.extend(BINANCE_SYMBOLS[coin] for coin in TARGET_COINS if coin in BINANCE_SYMBOLS)
+    return sorted(set(symbols))
+
+
+async def fetch_binance_tickers(client: httpx.AsyncClient) -> dict[str, Any]:
     """
-    Fetch prices for all TARGET_COINS from Binance in a single API call.
+    Download the Binance book tickers we care about and index them by symbol.
 
     API: GET https://api.binance.com/api/v3/ticker/bookTicker
-    Returns the best bid/ask for every symbol in one shot (no pagination).
+    Without parameters it returns the best bid/ask for every symbol on Binance
+    (thousands of entries, megabytes of JSON), so:
+
+      1. The list of binance_candidate_symbols() that actually exist is kept in
+         the discovery cache under "binance_symbols". While it is fresh we ask
+         only for those: ?symbols=["BTCUSDT","ETHUSDT",...] (a few KB).
+      2. Otherwise — or if the filtered call fails, e.g. Binance answers 400
+         because one of the symbols was delisted — we download the full dump
+         with stream_filtered_objects(), keep only candidate symbols, and refresh the
+         cached list from what we saw.
 
     Example response (truncated):
     [
@@ -702,26 +1209,55 @@ async def fetch_binance_prices(
       ...
     ]
 
-    We index this by symbol → dict for O(1) lookup, then loop over TARGET_COINS.
+    Returns a lookup dict: {"BTCUSDT": {symbol, bidPrice, askPrice, ...}, ...}
+    (empty when the request fails). This step needs no bridge rate, so it can
+    start right away; the COP conversion happens in convert_binance_prices().
     """
-    data = await request_json(
+    entry = await _load_catalogue("binance_symbols", exchange="binance")
+    if entry and entry.payload and entry.is_fresh(settings.discovery_cache_ttl_seconds):
+        data = await request_json(
+            client,
+            BINANCE_BOOK_TICKER_URL,
+            exchange="binance",
+            params={"symbols": json.dumps(entry.payload, separators=(",", ":"))},
+        )
+        if data:
+            return {item.get("symbol"): item for item in data}
+
+    data = await stream_filtered_objects(
         client,
-        "https://api.binance.com/api/v3/ticker/bookTicker",
+        BINANCE_BOOK_TICKER_URL,
         exchange="binance",
+        field="symbol",
+        wanted=set(binance_candidate_symbols()),
     )
     if not data:
-        return []
+        return {}
 
-    # Build a lookup dict: {"BTCUSDT": {symbol, bidPrice, askPrice, ...}, ...}
     market_data = {item.get("symbol"): item for item in data}
+    await _save_catalogue(
+        CatalogueEntry(key="binance_symbols", payload=sorted(market_data), fetched_at=time.time()),
+        exchange="binance",
+    )
+    return market_data
+
+
+def convert_binance_prices(
+    binance_tickers: dict[str, Any],
+    reference_bridge: BridgeRate,
+) -> list[PriceRecord]:
+    """
+    Turn the Binance tickers from fetch_binance_tickers() into COP PriceRecords.
+    Pure function: no I/O, it only picks a symbol per coin and applies the bridge.
+    """
     records: list[PriceRecord] = []
 
     for coin in TARGET_COINS:
-        selection = select_binance_symbol(coin, market_data)
+        selection = select_binance_symbol(coin, binance_tickers)
         if not selection:
             continue
         symbol, quote = selection
-        ticker = market_data.get(symbol)
+        ticker = binance_tickers.get(symbol)
         if not ticker:
             continue
 
@@ -752,12 +1288,9 @@ async def fetch_binance_prices(
     return records
 
 
-async def fetch_cryptomkt_prices(
-    client: httpx.AsyncClient,
-    reference_bridge: BridgeRate,
-) -> list[PriceRecord]:
+async def fetch_cryptomkt_tickers(client: httpx.AsyncClient) -> dict[str, Any]:
     """
-    Fetch prices for all TARGET_COINS from CryptoMKT in a single API call.
+    Download every CryptoMKT ticker in a single API call.
 
     API: GET https://api.exchange.cryptomkt.com/api/3/public/ticker
     Returns a dict keyed by symbol (unlike Binance which returns a list).
@@ -771,26 +1304,35 @@ async def fetch_cryptomkt_prices(
       ...
     }
 
-    CryptoMKT sometimes leaves ask/bid empty on illiquid pairs, so we fall back
-    to the `last` price via get_ticker_prices().
+    Returns the dict as-is (empty when the request fails).
     """
     data = await request_json(
         client,
         "https://api.exchange.cryptomkt.com/api/3/public/ticker",
         exchange="cryptomkt",
     )
-    if not data:
-        return []
+    return data or {}
 
+
+def convert_cryptomkt_prices(
+    cryptomkt_tickers: dict[str, Any],
+    reference_bridge: BridgeRate,
+) -> list[PriceRecord]:
+    """
+    Turn the CryptoMKT tickers from fetch_cryptomkt_tickers() into COP PriceRecords.
+
+    CryptoMKT sometimes leaves ask/bid empty on illiquid pairs, so we fall back
+    to the `last` price via get_ticker_prices().
+    """
     records: list[PriceRecord] = []
 
     for coin in TARGET_COINS:
-        selection = select_cryptomkt_market(coin, data, reference_bridge)
+        selection = select_cryptomkt_market(coin, cryptomkt_tickers, reference_bridge)
         if not selection:
             continue
 
         symbol, quote = selection
-        ticker = data.get(symbol, {})
+        ticker = cryptomkt_tickers.get(symbol, {})
         ask_price, bid_price = get_ticker_prices(ticker)
         if ask_price <= 0 or bid_price <= 0:
             continue
@@ -919,15 +1461,13 @@ async def fetch_bitso_prices(
     return records
 
 
-async def fetch_buda_prices(
+async def fetch_buda_tickers(
     client: httpx.AsyncClient,
     available_markets: set[str],
-    reference_bridge: BridgeRate,
-) -> list[PriceRecord]:
+) -> dict[str, dict[str, Any]]:
     """
-    Fetch prices for all TARGET_COINS from Buda.
-    Buda only has direct COP pairs (e.g. BTC-COP), so no bridge conversion needed
-    for the COP prices. We still derive USD values using the reference bridge.
+    Fetch the raw Buda ticker for every TARGET_COINS market that exists.
+    Buda only has direct COP pairs (e.g. BTC-COP).
 
     API: GET https://www.buda.com/api/v2/markets/{market}/ticker
     e.g. market="btc-cop"
@@ -944,24 +1484,44 @@ async def fetch_buda_prices(
       }
     }
 
+    Returns {coin: ticker} for every market that answered, in TARGET_COINS order.
+    Buda has one request per market, so they are fired concurrently; the run's
+    per-host limit (FETCH_HOST_CONCURRENCY) keeps the burst polite.
+    """
+    # Skip coins not available on Buda
+    coins = [
+        coin for coin in TARGET_COINS
+        if not available_markets or f"{coin}-cop" in available_markets
+    ]
+    responses = await asyncio.gather(*[
+        request_json(client, f"https://www.buda.com/api/v2/markets/{coin}-cop/ticker", exchange="buda")
+        for coin in coins
+    ])
+
+    tickers: dict[str, dict[str, Any]] = {}
+    for coin, data in zip(coins, responses):
+        ticker = (data or {}).get("ticker")
+        if ticker:
+            tickers[coin] = ticker
+
+    return tickers
+
+
+def convert_buda_prices(
+    buda_tickers: dict[str, dict[str, Any]],
+    reference_bridge: BridgeRate,
+) -> list[PriceRecord]:
+    """
+    Turn the Buda tickers from fetch_buda_tickers() into PriceRecords.
+    The COP prices are direct; we only derive USD values using the reference bridge.
     Prices come as [value, currency] arrays; we take index [0] for the number.
-    Note: Buda also has one request per market, but the number of markets we
-    track is small so we keep it sequential for simplicity.
     """
     records: list[PriceRecord] = []
 
     for coin in TARGET_COINS:
-        market = f"{coin}-cop"
-        # Skip coins not available on Buda
-        if available_markets and market not in available_markets:
+        ticker = buda_tickers.get(coin)
+        if not ticker:
             continue
-
-        data = await request_json(
-            client,
-            f"https://www.buda.com/api/v2/markets/{market}/ticker",
-            exchange="buda",
-        )
-        ticker = (data or {}).get("ticker", {})
         min_ask = ticker.get("min_ask") or []  # e.g. ["278500000.0", "COP"]
         max_bid = ticker.get("max_bid") or []  # e.g. ["276000000.0", "COP"]
         buy_cop = safe_float(min_ask[0] if min_ask else None)
@@ -1229,78 +1789,333 @@ async def fetch_dolarapp_prices(client: httpx.AsyncClient) -> list[PriceRecord]:
     return records
 
 
+# ── Stage scheduler ───────────────────────────────────────────────────────────
+# A fetch run is a small dependency graph: Binance/CryptoMKT/fintech tickers need
+# nothing up front, Bitso prices need the book list and bridges, and the USD → COP
+# conversion needs the reference bridge. Each Stage declares what it depends on and
+# starts as soon as those results exist, so no request waits on an unrelated one.
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One node of the collection graph.
+
+      name       — unique key; the stage result is stored under this name
+      run        — called with the results of `depends_on` as positional arguments,
+                   in that order. Coroutine functions are network stages and are
+                   awaited; plain functions are pure conversion steps.
+      depends_on — names of stages that must finish first. They must be declared
+                   earlier in the list, which also rules out cycles.
+      default    — result used when a network stage is cut off by the deadline
+                   (the same "nothing came back" value the fetch function returns
+                   on failure, e.g. an empty set / dict / list)
+    """
+    name: str
+    run: Callable[..., Any]
+    depends_on: tuple[str, ...] = ()
+    default: Any = None
+
+    @property
+    def is_pure(self) -> bool:
+        return not inspect.iscoroutinefunction(self.run)
+
+
+@dataclass
+class StageRun:
+    """
+    Outcome of run_stages().
+
+      results — {stage name: result}, with defaults filled in for cut-off stages
+      seconds — each finished stage's own duration (from "dependencies ready" to done)
+      cut_off — network stages cancelled because the deadline passed
+    """
+    results: dict[str, Any] = field(default_factory=dict)
+    seconds: dict[str, float] = field(default_factory=dict)
+    cut_off: list[str] = field(default_factory=list)
+    breakers: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+async def _run_stage(
+    stage: Stage,
+    dependencies: list["asyncio.Task[Any]"],
+    seconds: dict[str, float],
+) -> Any:
+    """Wait for the dependencies of `stage`, then run it with their results."""
+    values = await asyncio.gather(*dependencies)
+    started = time.perf_counter()
+    result = stage.run(*values)
+    if inspect.isawaitable(result):
+        result = await result
+    seconds[stage.name] = time.perf_counter() - started
+    return result
+
+
+async def run_stages(stages: Iterable[Stage], deadline: Optional[float] = None) -> StageRun:
+    """
+    Run every stage as early as its dependencies allow.
+
+    All stages are scheduled at once; a stage only blocks on the tasks it declared
+    in `depends_on`. If any stage raises, the remaining ones are cancelled and the
+    exception propagates.
+
+    `deadline` is an event-loop time (loop.time()). When it passes, every stage
+    still running is cancelled: network stages are recorded as cut off and get
+    their `default`; pure stages are still run with whatever their dependencies
+    produced (real results or defaults), so providers that did finish keep their data.
+    """
+    stages = list(stages)
+    outcome = StageRun()
+    tasks: dict[str, asyncio.Task[Any]] = {}
+    try:
+        for stage in stages:
+            if stage.name in tasks:
+                raise ValueError(f"Duplicate stage name: {stage.name!r}")
+            missing = [name for name in stage.depends_on if name not in tasks]
+            if missing:
+                raise ValueError(f"Stage {stage.name!r} depends on undeclared stage(s): {missing}")
+            dependencies = [tasks[name] for name in stage.depends_on]
+            tasks[stage.name] = asyncio.create_task(_run_stage(stage, dependencies, outcome.seconds))
+
+        timeout = None
+        if deadline is not None:
+            timeout = max(0.0, deadline - asyncio.get_running_loop().time())
+        done, pending = await asyncio.wait(
+            tasks.values(),
+            timeout=timeout,
+            return_when=asyncio.FIRST_EXCEPTION,
+        )
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    for stage in stages:
+        task = tasks[stage.name]
+        if not task.cancelled():
+            outcome.results[stage.name] = task.result()
+        elif stage.is_pure:
+            outcome.results[stage.name] = stage.run(*(outcome.results[name] for name in stage.depends_on))
+        else:
+            outcome.results[stage.name] = stage.default
+            outcome.cut_off.append(stage.name)
+
+    return outcome
+
+
 # ── Orchestration ─────────────────────────────────────────────────────────────
 
-async def collect_prices() -> list[PriceRecord]:
+# Stage names whose result is a list[PriceRecord] for one provider.
+PROVIDERS = ("binance", "cryptomkt", "bitso", "buda", "global66", "plenti", "dolarapp")
+
+# Part of the run budget kept for the database write after collection.
+DB_WRITE_RESERVE_SECONDS = 2.0
+
+
+def build_collection_stages(client: httpx.AsyncClient) -> list[Stage]:
+    """
+    Describe a full collection run as Stages.
+
+    Dependency graph (→ = "is needed by"):
+
+      bitso_books  → bitso_bridges → reference_bridge → binance, cryptomkt, buda
+                   ↘ bitso ←──────┘
+      buda_markets → buda_bridges  ↗
+                   → buda_tickers  → buda
+      binance_tickers, cryptomkt_tickers, global66, plenti, dolarapp: no dependencies
+
+    Every network request that doesn't need a bridge starts immediately; the
+    bridge-dependent conversion (convert_*_prices) runs as a pure later step.
+    """
+    return [
+        # Market discovery
+        Stage("bitso_books", partial(fetch_bitso_available_books, client), default=set()),
+        Stage("buda_markets", partial(fetch_buda_available_markets, client), default=set()),
+        # Bridge rates, reusing the discovery results instead of re-fetching them
+        Stage("bitso_bridges", partial(fetch_bitso_bridge_rates, client), ("bitso_books",), default={}),
+        Stage("buda_bridges", partial(fetch_buda_bridge_rates, client), ("buda_markets",), default={}),
+        Stage("reference_bridge", select_reference_bridge, ("bitso_bridges", "buda_bridges")),
+        # Raw tickers: no bridge needed to download them
+        Stage("binance_tickers", partial(fetch_binance_tickers, client), default={}),
+        Stage("cryptomkt_tickers", partial(fetch_cryptomkt_tickers, client), default={}),
+        Stage("buda_tickers", partial(fetch_buda_tickers, client), ("buda_markets",), default={}),
+        Stage("global66", partial(fetch_global66_prices, client), default=[]),
+        Stage("plenti", partial(fetch_plenti_prices, client), default=[]),
+        Stage("dolarapp", partial(fetch_dolarapp_prices, client), default=[]),
+        # Bitso picks its books based on which bridges exist, so it waits for them
+        Stage("bitso", partial(fetch_bitso_prices, client), ("bitso_books", "bitso_bridges"), default=[]),
+        # Pure conversion steps
+        Stage("binance", convert_binance_prices, ("binance_tickers", "reference_bridge")),
+        Stage("cryptomkt", convert_cryptomkt_prices, ("cryptomkt_tickers", "reference_bridge")),
+        Stage("buda", convert_buda_prices, ("buda_tickers", "reference_bridge")),
+    ]
+
+
+def _providers_cut_off(stages: list[Stage], cut_off: list[str]) -> list[str]:
+    """PROVIDERS whose own stage, or a stage they depend on, was cut off."""
+    affected = set(cut_off)
+    for stage in stages:  # declaration order = dependencies first
+        dependencies = set(stage.depends_on)
+        if stage.name == "reference_bridge":
+            # Falls back to the other bridge source unless both are missing
+            if dependencies <= affected:
+                affected.add(stage.name)
+        elif dependencies & affected:
+            affected.add(stage.name)
+    return [provider for provider in PROVIDERS if provider in affected]
+
+
+async def collect_prices(
+    summary: Optional[FetchSummary] = None,
+    deadline: Optional[float] = None,
+) -> list[PriceRecord]:
     """
     Orchestrate a full price collection run across all providers.
 
-    Execution order:
-      1. Fetch available books/markets from Bitso and Buda (needed for next steps).
-      2. Fetch bridge rates (USDT/COP, USDC/COP) from Bitso and Buda.
-      3. Select the best available bridge rate as the global reference.
-      4. Fetch prices from all 7 providers in PARALLEL (asyncio.gather).
-      5. Stamp every record with the same `last_updated` timestamp.
+    The run is described by build_collection_stages() and executed by
+    run_stages(): discovery, bridge rates, raw tickers and fintech quotes all
+    start as soon as their own inputs are ready, and the USD → COP conversion
+    runs once the reference bridge is known. Wall-clock time is therefore the
+    longest dependency chain instead of the sum of the sequential setup steps.
+
+    `deadline` (an event-loop time) bounds the run: every request gets at most
+    the remaining time as its timeout, and stages still running when it passes
+    are cancelled. Providers that finished are returned as usual; providers
+    affected by a cut-off stage are not, including those converted with the
+    fallback bridge rate because both bridge sources were cut off.
 
-    Steps 1-3 are sequential because each step depends on the previous.
-    Step 4 is fully parallel — all exchanges are queried at the same time.
+    Every record is then stamped with the same `last_updated` timestamp.
+    All requests made during the run share one RequestCache, so a URL wanted
+    by several stages is only requested once.
 
     Returns a flat list of PriceRecord objects ready for database insertion.
+    Run statistics are written to `summary` when one is given.
     """
-    refreshed_at = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        # Sequential setup: need available books before fetching bridge rates
-        bitso_books   = await fetch_bitso_available_books(client)
-        buda_markets  = await fetch_buda_available_markets(client)
-        bitso_bridges = await fetch_bitso_bridge_rates(client)
-        buda_bridges  = await fetch_buda_bridge_rates(client)
-
-        # Choose the best stable coin rate to use as our COP/USD reference
-        reference_bridge = select_reference_bridge(bitso_bridges, buda_bridges)
-
-        # Fetch all providers simultaneously — this is the main performance win
-        provider_results = await asyncio.gather(
-            fetch_binance_prices(client, reference_bridge),
-            fetch_cryptomkt_prices(client, reference_bridge),
-            fetch_bitso_prices(client, bitso_books, bitso_bridges),
-            fetch_buda_prices(client, buda_markets, reference_bridge),
-            fetch_global66_prices(client),
-            fetch_plenti_prices(client),
-            fetch_dolarapp_prices(client),
-        )
+    refreshed_at = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+
+    run = FetchRun(settings.fetch_host_concurrency, deadline)
+    run_token = _current_run.set(run)
+    try:
+        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS) as client:
+            stages = build_collection_stages(client)
+            outcome = await run_stages(stages, deadline)
+            run.cache.cancel_pending()
+    finally:
+        _current_run.reset(run_token)
+
+    results = outcome.results
+    reference_bridge: BridgeRate = results["reference_bridge"]
+    cut_off = _providers_cut_off(stages, outcome.cut_off)
 
-    # Flatten the list of lists into a single list
-    records = [record for provider_records in provider_results for record in provider_records]
+    # A cut-off provider has no data, or was converted with DEFAULT_BRIDGE_RATE
+    # because both bridge sources were cut off: keep none of its rows
+    dropped = {provider: len(results[provider]) for provider in cut_off if results[provider]}
+
+    # Flatten the provider lists into a single list, in PROVIDERS order
+    records = [record for provider in PROVIDERS if provider not in cut_off for record in results[provider]]
 
     # Stamp all records with the same timestamp using dataclasses.replace()
     # (avoids rebuilding each record from scratch)
     records = [replace(r, last_updated=refreshed_at) for r in records]
 
     print(f"ℹ️ Reference bridge: {reference_bridge.coin.upper()} buy={reference_bridge.buy:.2f} sell={reference_bridge.sell:.2f}")
-    print(f"ℹ️ Collected {len(records)} price rows.")
+    print(f"ℹ️ Collected {len(records)} price rows ({run.cache.hits} duplicate requests served from the run cache).")
+    print("⏱️ " + ", ".join(f"{name}={seconds:.2f}s" for name, seconds in outcome.seconds.items()))
+    if outcome.cut_off:
+        print(f"⚠️ Deadline reached: cut off {', '.join(outcome.cut_off)} (providers affected: {', '.join(cut_off) or 'none'})")
+    if dropped:
+        print(f"⚠️ Discarded rows converted with the fallback bridge rate: {', '.join(f'{name}={count}' for name, count in dropped.items())}")
+    breakers = provider_health_snapshot()
+    tripped = [f"{name}={health['state']}" for name, health in breakers.items() if health["state"] != "closed"]
+    if tripped:
+        print(f"⚠️ Circuit breakers not closed: {', '.join(tripped)}")
+    if summary is not None:
+        summary.request_cache_hits = run.cache.hits
+        summary.breakers = breakers
+        summary.stage_seconds = {name: round(seconds, 3) for name, seconds in outcome.seconds.items()}
+        summary.cut_off = cut_off
     return records
 
 
-async def run_fetcher() -> None:
+def save_prices(records: list[PriceRecord]) -> UpsertResult:
+    """
+    Persist one run: upsert the records whose price moved, record a heartbeat
+    per reported provider, and commit everything in one transaction. Blocking — run_fetcher
+    calls it on the background DB thread.
+
+    The data version is only bumped when a price row was written: a run that
+    changed nothing doesn't make every instance rebuild its snapshots or send
+    stream clients an empty update. The refreshed heartbeat timestamps reach
+    responses with the next snapshot rebuild (PRICE_SNAPSHOT_TTL_SECONDS).
+    """
+    if not records:
+        return UpsertResult()
+
+    version = None
+    with Session(engine) as session:
+        result = upsert_prices(session, records)
+        record_heartbeats(session, records)
+        if result.changed:
+            version = bump_data_version(session)
+        session.commit()  # commit all upserts in one transaction
+
+    if version is not None:
+        data_changed(version)
+    return result
+
+
+async def run_fetcher(budget_seconds: Optional[float] = None) -> FetchSummary:
     """
     Entry point for the full fetch-and-save pipeline.
     Called by GitHub Actions every 15 minutes (see .github/workflows/fetcher.yml).
 
     Steps:
-      1. Ensure DB tables exist (idempotent — safe to call on every run).
-      2. Collect prices from all providers.
-      3. Upsert all records into PostgreSQL and commit.
+      1. Check the DB schema is current (see app/db/migrations.py; cached per process).
+      2. Collect prices from all providers, within the time budget.
+      3. Upsert the records whose price moved, record a heartbeat per reported provider,
+         and commit (save_prices).
+
+    Steps 1 and 3 run on the background DB thread, so the event loop stays free
+    for other requests while the run is writing.
+
+    `budget_seconds` (default FETCH_BUDGET_SECONDS) is the total wall-clock time
+    the run may take. Collection gets the budget minus DB_WRITE_RESERVE_SECONDS;
+    providers still running at that point are cancelled, whatever finished is
+    committed, and the cut-off providers are listed in the summary.
+
+    Returns a FetchSummary with changed vs. unchanged row counts.
     """
+    if budget_seconds is None:
+        budget_seconds = settings.fetch_budget_seconds
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max(0.0, budget_seconds - DB_WRITE_RESERVE_SECONDS)
+
     print("🚀 Iniciando recolección de datos para Postgres...")
-    create_db_and_tables()  # creates tables if they don't exist yet
+    # DB work runs on the background DB thread so other requests served by this
+    # event loop (e.g. /api/prices) aren't stalled while we write
+    await run_in_db_thread(ensure_schema_current)  # one cached query; migrations are run separately
+
+    summary = FetchSummary()
+    records = await collect_prices(summary, deadline)
+    summary.refreshed_at = format_timestamp(records[0].last_updated) if records else ""
+    summary.collected = len(records)
+    for record in records:
+        summary.provider_rows[record.exchange] = summary.provider_rows.get(record.exchange, 0) + 1
+    summary.providers = summary.provider_outcomes()
 
-    records = await collect_prices()
-    with Session(engine) as session:
-        upserted = upsert_prices(session, records)
-        session.commit()  # commit all upserts in one transaction
+    result = await run_in_db_thread(save_prices, records)
 
-    print(f"✅ Sincronización completada. {upserted} filas insertadas/actualizadas.")
+    summary.changed = result.changed
+    summary.unchanged = result.unchanged
+    print(
+        f"✅ Sincronización completada. {summary.changed} filas cambiaron, "
+        f"{summary.unchanged} sin cambios."
+    )
+    return summary
 
 
 if __name__ == "__main__":
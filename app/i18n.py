@@ -12,6 +12,8 @@ Usage:
     raise HTTPException(status_code=401, detail=t("unauthorized", lang))
 """
 
+from functools import lru_cache
+
 from fastapi import Request
 
 # Translation key constants — import these instead of using raw strings.
@@ -45,7 +47,13 @@ def get_lang(request: Request) -> str:
       2. First language tag in a full Accept-Language header (e.g. 'en-US,en;q=0.9')
       3. Default: 'es'
     """
-    header = request.headers.get("Accept-Language", "")
+    return lang_from_header(request.headers.get("Accept-Language", ""))
+
+
+# Browsers send a handful of distinct headers, so each is parsed once
+@lru_cache(maxsize=256)
+def lang_from_header(header: str) -> str:
+    """get_lang() for a raw Accept-Language value."""
     if not header:
         return "es"
 
@@ -2,7 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
-from app.db.session import create_db_and_tables
+from app.core.config import settings
+from app.db.migrations import check_schema_version
 
 app = FastAPI()
 
@@ -19,4 +20,7 @@ app.include_router(api_router)
 
 @app.on_event("startup")
 def on_startup():
-    create_db_and_tables()
+    # Skipped on serverless, where every cold start would pay for the round
+    # trip before its first response; the fetcher still checks before writing.
+    if not settings.serverless:
+        check_schema_version()
@@ -1,6 +1,19 @@
 from .crypto_price import CryptoPrice
+from .discovery_cache import DiscoveryCache
+from .fetch_job import FetchJob
+from .manual_price import ManualPrice
 from .platform_info import PlatformInfo
 from .platform_referral_click import PlatformReferralClick
+from .provider_heartbeat import ProviderHeartbeat
 from .stablecoin_price import StablecoinPrice
 
-__all__ = ["CryptoPrice", "PlatformInfo", "PlatformReferralClick", "StablecoinPrice"]
+__all__ = [
+    "CryptoPrice",
+    "DiscoveryCache",
+    "FetchJob",
+    "ManualPrice",
+    "PlatformInfo",
+    "PlatformReferralClick",
+    "ProviderHeartbeat",
+    "StablecoinPrice",
+]
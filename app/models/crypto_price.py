@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Column, DateTime, Index
 from sqlmodel import Field, SQLModel
 
 
 class CryptoPrice(SQLModel, table=True):
     __tablename__ = "crypto_prices"
+    # Prices are read by coin (build_price_response); the (exchange, coin)
+    # primary key can't serve that lookup directly.
+    __table_args__ = (Index("ix_crypto_prices_coin_exchange", "coin", "exchange"),)
 
     exchange: str = Field(primary_key=True)
     coin: str = Field(primary_key=True)
@@ -17,4 +22,4 @@ class CryptoPrice(SQLModel, table=True):
     spread: float = 0
     direct_cop: bool = True
     usd_bridge: str = ""
-    last_updated: Optional[str] = None
+    last_updated: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True), index=True))
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, Text
+from sqlmodel import Field, SQLModel
+
+
+class DiscoveryCache(SQLModel, table=True):
+    __tablename__ = "discovery_cache"
+
+    key: str = Field(primary_key=True)
+    payload: str = Field(sa_column=Column(Text))
+    etag: str = ""
+    last_modified: str = ""
+    fetched_at: float = 0
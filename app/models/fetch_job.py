@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, Text
+from sqlmodel import Field, SQLModel
+
+
+class FetchJob(SQLModel, table=True):
+    __tablename__ = "fetch_job"
+
+    id: str = Field(primary_key=True)
+    status: str = Field(default="running", index=True)  # running | succeeded | failed
+    trigger_ip: str = ""
+    started_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    summary: Optional[str] = Field(default=None, sa_column=Column(Text))  # FetchSummary.as_dict() as JSON
+    error: str = ""
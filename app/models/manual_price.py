@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class ManualPrice(SQLModel, table=True):
+    """
+    One manually entered price, per platform and coin, derived from
+    PlatformInfo.manual_prices whenever a platform is saved (see
+    app/services/manual_prices.py). Fintech aliases ("usd" → usdt/usdc,
+    "eur" → euroc) are already expanded and USD rates already converted to COP.
+    """
+    __tablename__ = "manual_price"
+
+    platform_id: str = Field(primary_key=True, foreign_key="platform_info.id", ondelete="CASCADE")
+    coin: str = Field(primary_key=True, index=True)
+    currency: str = "COP"
+    buy: Optional[str] = None  # as entered: a number or a placeholder such as "N.D."
+    sell: Optional[str] = None
+    buy_cop: Optional[float] = None  # None when `buy` is not a number
+    sell_cop: Optional[float] = None
+    active: bool = True
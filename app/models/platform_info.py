@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from typing import Optional
 
-from sqlalchemy import Column, Text
+from sqlalchemy import Column, Index, Text, text
 from sqlmodel import Field, SQLModel
 
 
 class PlatformInfo(SQLModel, table=True):
     __tablename__ = "platform_info"
+    # Nearly every read wants only the active platforms
+    __table_args__ = (Index("ix_platform_info_active", "id", postgresql_where=text("is_active")),)
 
     id: str = Field(primary_key=True, index=True)
     name: str
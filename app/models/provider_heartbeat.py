@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import Field, SQLModel
+
+
+class ProviderHeartbeat(SQLModel, table=True):
+    __tablename__ = "provider_heartbeat"
+
+    # One row per provider: the coins it reported on its last run, and when.
+    # A coin it stops returning drops out of `coins`, so its price shows as stale
+    exchange: str = Field(primary_key=True)
+    coins: list[str] = Field(default_factory=list, sa_column=Column(ARRAY(String), nullable=False))
+    last_checked: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True)))
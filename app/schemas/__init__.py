@@ -1,3 +1,4 @@
 from .auth import LoginRequest
-from .platform import PlatformUpdate
+from .config import ConfigResponse
+from .platform import PlatformItem, PlatformUpdate
 from .price import PriceResponse
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class ConfigResponse(BaseModel):
+    crypto: list[str]
+    stablecoins: list[str]
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Optional
 
 from pydantic import BaseModel
 
@@ -26,3 +26,9 @@ class PlatformUpdate(BaseModel):
     manual_prices: Dict
     is_manual: bool
     is_active: bool
+
+
+class PlatformItem(PlatformUpdate):
+    """One platform in GET /api/platforms (texts already in the requested language)."""
+
+    last_updated: Optional[str] = None
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from pydantic import BaseModel
 
@@ -6,3 +6,8 @@ from pydantic import BaseModel
 class PriceResponse(BaseModel):
     coin: str
     prices: list[dict[str, Any]]
+    version: Optional[int] = None  # data version, for ?since=
+
+
+class PricesResponse(BaseModel):
+    coins: list[PriceResponse]
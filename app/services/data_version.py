@@ -0,0 +1,180 @@
+"""
+data_version.py — Tell every process when prices or platforms change.
+
+In-process caches (the price snapshot) can't see writes made by another
+uvicorn worker or serverless instance. So every write path bumps a single
+counter in the data_version table, inside its own transaction, and queues a
+NOTIFY on DATA_CHANGED_CHANNEL that Postgres delivers when it commits.
+
+Each API process runs one background watcher (DATA_VERSION_MODE):
+  - "listen" → a dedicated connection LISTENs on the channel (default for
+               long-lived workers). It needs a session-mode connection, so it is
+               not the default behind a transaction-mode PgBouncer.
+  - "poll"   → reads the counter every DATA_VERSION_POLL_SECONDS (default on
+               serverless and with DB_PGBOUNCER), on one connection kept for
+               all polls: with NullPool, the serverless default, checking one
+               out of the engine would open a new Postgres connection each time.
+  - "off"    → no watcher; caches rely on their TTL.
+
+When the watcher sees a newer version it runs the subscribed callbacks (e.g.
+invalidate_price_snapshot). Readers only ever compare in-memory versions: no
+request touches the database to check freshness.
+"""
+
+import contextlib
+import logging
+import select
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+DATA_CHANGED_CHANNEL = "data_changed"
+LISTEN_IDLE_CHECK_SECONDS = 60.0  # ping the LISTEN connection when nothing arrived for this long
+RECONNECT_SECONDS = 5.0
+
+_subscribers: list[Callable[[], None]] = []
+_seen_version = 0
+_seen_lock = threading.Lock()
+_watcher: Optional[threading.Thread] = None
+_watcher_lock = threading.Lock()
+
+
+def bump_data_version(session: Session) -> int:
+    """
+    Increment the data version and queue the NOTIFY. Call inside the writing
+    transaction, before commit: Postgres only sends the notification if the
+    transaction commits. Returns the new version, for data_changed() after commit.
+    """
+    version = session.execute(
+        text("UPDATE data_version SET version = version + 1 WHERE id = 1 RETURNING version")
+    ).scalar()
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": DATA_CHANGED_CHANNEL, "payload": str(version)},
+    )
+    return version
+
+
+def read_data_version(session: Session) -> Optional[int]:
+    """Current data version, or None while the data_version migration is pending."""
+    try:
+        return session.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar()
+    except ProgrammingError:
+        session.rollback()
+        return None
+
+
+async def read_data_version_async(session: AsyncSession) -> Optional[int]:
+    """read_data_version() on an AsyncSession."""
+    try:
+        return (await session.execute(text("SELECT version FROM data_version WHERE id = 1"))).scalar()
+    except ProgrammingError:
+        await session.rollback()
+        return None
+
+
+def subscribe(callback: Callable[[], None]) -> None:
+    """Run `callback` (no arguments) whenever a newer data version is seen."""
+    _subscribers.append(callback)
+
+
+def data_changed(version: int) -> None:
+    """
+    Record a data version seen by this process: our own commit, a notification
+    or a poll. Subscribers run once per new version; repeats and older
+    versions (e.g. the NOTIFY echo of our own commit) are ignored.
+    """
+    global _seen_version
+    with _seen_lock:
+        if version <= _seen_version:
+            return
+        _seen_version = version
+    for callback in _subscribers:
+        callback()
+
+
+def start_data_version_watcher() -> None:
+    """Start this process's watcher thread for DATA_VERSION_MODE, once."""
+    global _watcher
+    if _watcher is not None or settings.data_version_mode == "off":
+        return
+    with _watcher_lock:
+        if _watcher is not None:
+            return
+        target = _listen_forever if settings.data_version_mode == "listen" else _poll_forever
+        _watcher = threading.Thread(target=target, name="data-version-watcher", daemon=True)
+        _watcher.start()
+
+
+# ── Watchers ──────────────────────────────────────────────────────────────────
+
+@contextlib.contextmanager
+def _own_connection() -> Iterator[Any]:
+    """A DBAPI connection of our own in autocommit, detached from the pool: it stays checked out until closed."""
+    pooled = engine.raw_connection()
+    connection = pooled.dbapi_connection
+    pooled.detach()
+    try:
+        connection.autocommit = True
+        yield connection
+    finally:
+        pooled.close()
+
+
+def _read_version(cursor) -> int:
+    cursor.execute("SELECT version FROM data_version WHERE id = 1")
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def _poll_forever() -> None:
+    while True:
+        try:
+            _poll()
+        except Exception as exc:
+            logger.warning("Data version poll failed: %s", exc)
+        time.sleep(settings.data_version_poll_seconds)
+
+
+def _poll() -> None:
+    # One connection for every poll, until it fails
+    with _own_connection() as connection, connection.cursor() as cursor:
+        while True:
+            data_changed(_read_version(cursor))
+            time.sleep(settings.data_version_poll_seconds)
+
+
+def _listen_forever() -> None:
+    while True:
+        try:
+            _listen()
+        except Exception as exc:
+            logger.warning("Data version listener disconnected: %s", exc)
+        time.sleep(RECONNECT_SECONDS)
+
+
+def _listen() -> None:
+    with _own_connection() as connection, connection.cursor() as cursor:
+        cursor.execute(f"LISTEN {DATA_CHANGED_CHANNEL}")
+        # Catch up on whatever changed while we weren't listening
+        data_changed(_read_version(cursor))
+
+        while True:
+            readable, _, _ = select.select([connection], [], [], LISTEN_IDLE_CHECK_SECONDS)
+            if not readable:
+                cursor.execute("SELECT 1")  # raises if the connection died silently
+                continue
+            connection.poll()
+            while connection.notifies:
+                notification = connection.notifies.pop(0)
+                data_changed(int(notification.payload))
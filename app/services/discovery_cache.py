@@ -0,0 +1,132 @@
+"""
+discovery_cache.py — Cross-run cache for exchange market discovery catalogues.
+
+The fetcher asks Bitso and Buda which markets they list before fetching prices.
+Those lists change maybe once a month, so instead of downloading them on every
+15-minute run we keep the last answer here, together with the validators the
+exchange sent (ETag / Last-Modified), and only go back to the network once the
+entry is older than DISCOVERY_CACHE_TTL_SECONDS.
+
+Two backends:
+  - "db"   → the discovery_cache table (shared by every worker/instance)
+  - "file" → a JSON file, default /tmp/… (for serverless, where /tmp survives
+             between warm invocations)
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models import DiscoveryCache
+
+
+@dataclass
+class CatalogueEntry:
+    """
+    One cached catalogue.
+
+      key           — e.g. "bitso_books"
+      payload       — the parsed catalogue (JSON-serializable, e.g. a list of names)
+      etag          — ETag header of the response that produced `payload`, if any
+      last_modified — Last-Modified header of that response, if any
+      fetched_at    — epoch seconds of the last successful fetch or revalidation
+    """
+    key: str
+    payload: Any
+    etag: str = ""
+    last_modified: str = ""
+    fetched_at: float = 0.0
+
+    def is_fresh(self, ttl_seconds: float, now: Optional[float] = None) -> bool:
+        """True while the entry is younger than `ttl_seconds`."""
+        now = time.time() if now is None else now
+        return now - self.fetched_at < ttl_seconds
+
+
+# get_discovery_store() returns a new FileDiscoveryStore per call, so the lock
+# that serializes saves (run concurrently via asyncio.to_thread) is shared.
+_file_lock = threading.Lock()
+
+
+class FileDiscoveryStore:
+    """Keeps every entry in one JSON file: {key: CatalogueEntry fields}."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def _read_all(self) -> dict[str, Any]:
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, key: str) -> Optional[CatalogueEntry]:
+        raw = self._read_all().get(key)
+        return CatalogueEntry(**raw) if raw else None
+
+    def save(self, entry: CatalogueEntry) -> None:
+        # The lock keeps concurrent saves in this process from dropping each
+        # other's keys. Each write goes to its own temp file in the same
+        # directory, then os.replace() swaps it in atomically, so a reader or
+        # another process never sees half a JSON document.
+        with _file_lock:
+            entries = self._read_all()
+            entries[entry.key] = asdict(entry)
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(prefix=".discovery-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(entries, handle)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                raise
+
+
+class DatabaseDiscoveryStore:
+    """Keeps entries in the discovery_cache table."""
+
+    def load(self, key: str) -> Optional[CatalogueEntry]:
+        with Session(engine) as session:
+            row = session.get(DiscoveryCache, key)
+            if not row:
+                return None
+            return CatalogueEntry(
+                key=row.key,
+                payload=json.loads(row.payload),
+                etag=row.etag,
+                last_modified=row.last_modified,
+                fetched_at=row.fetched_at,
+            )
+
+    def save(self, entry: CatalogueEntry) -> None:
+        with Session(engine) as session:
+            session.merge(
+                DiscoveryCache(
+                    key=entry.key,
+                    payload=json.dumps(entry.payload),
+                    etag=entry.etag,
+                    last_modified=entry.last_modified,
+                    fetched_at=entry.fetched_at,
+                )
+            )
+            session.commit()
+
+
+def get_discovery_store():
+    """Return the store selected by DISCOVERY_CACHE_BACKEND."""
+    if settings.discovery_cache_backend == "file":
+        return FileDiscoveryStore(settings.discovery_cache_path)
+    return DatabaseDiscoveryStore()
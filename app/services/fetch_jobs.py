@@ -0,0 +1,240 @@
+"""
+fetch_jobs.py — Single-flight background fetch runs for the cron endpoint.
+
+A trigger of /api/cron/fetcher no longer runs the fetcher inside the request:
+
+  1. It takes a Postgres advisory lock (FETCH_LOCK_KEY), so only one fetch runs
+     across every worker and replica.
+  2. It records a FetchJob row ("running") and starts run_fetcher() as an
+     asyncio task, returning the job id straight away.
+  3. When the run ends the row gets its status, duration and summary, and the
+     lock is released.
+
+A trigger that arrives while a fetch is running attaches to that job instead
+of starting a second one.
+
+The lock is transaction-scoped (pg_try_advisory_xact_lock) and held by a
+transaction that stays open for the whole run, so it also works behind a
+transaction-pooling PgBouncer, and Postgres releases it by itself if the
+process dies mid-run.
+
+All of this database work runs on the background DB thread (run_in_db_thread),
+never on the event loop.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Transaction
+from sqlmodel import Session, select
+
+from app.db.session import engine, run_in_db_thread
+from app.fetcher import run_fetcher
+from app.models import FetchJob
+
+logger = logging.getLogger(__name__)
+
+# Any constant bigint works, as long as every replica uses the same one.
+FETCH_LOCK_KEY = 7_302_114_052
+
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+JOB_POLL_SECONDS = 0.5
+
+# Jobs started by this process that haven't finished yet. Holding the task here
+# also keeps it from being garbage-collected while it runs.
+_tasks: dict[str, asyncio.Task] = {}
+# Serializes start_fetch_job() within a process, across its awaits
+_start_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+class FetchAlreadyRunning(Exception):
+    """Another process holds the fetch lock but its job row isn't visible yet."""
+
+
+@dataclass
+class JobHandle:
+    """
+    Result of start_fetch_job().
+
+      job_id   — the job that is running (new or existing)
+      attached — True when the trigger joined an already running job
+      task     — the asyncio task, when the job runs in this process
+    """
+    job_id: str
+    attached: bool
+    task: Optional[asyncio.Task] = None
+
+
+async def start_fetch_job(trigger_ip: str = "") -> JobHandle:
+    """
+    Start a fetch run in the background, or attach to the one already running.
+
+    Two triggers handled by the same process queue on an asyncio lock, so only
+    the first takes the advisory lock; the second attaches to its task.
+    """
+    lock = _start_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+    async with lock:
+        for job_id, task in _tasks.items():
+            if not task.done():
+                return JobHandle(job_id, attached=True, task=task)
+
+        connection, transaction, job_id = await run_in_db_thread(_lock_and_create_job, trigger_ip)
+        if job_id is None:
+            running = await run_in_db_thread(_latest_running_job)
+            if running is None:
+                raise FetchAlreadyRunning("The fetch lock is held but no running job is recorded yet.")
+            return JobHandle(running.id, attached=True)
+
+        task = asyncio.create_task(_run_job(job_id, connection, transaction))
+        _tasks[job_id] = task
+        task.add_done_callback(lambda _task: _tasks.pop(job_id, None))
+    logger.info("Fetch job %s started from ip=%s", job_id, trigger_ip)
+    return JobHandle(job_id, attached=False, task=task)
+
+
+async def wait_for_job(handle: JobHandle, timeout: float) -> Optional[dict[str, Any]]:
+    """
+    Wait up to `timeout` seconds for the job to finish and return its payload.
+    Jobs running in another process are polled in the database.
+    """
+    if handle.task is not None:
+        # shield(): a client disconnecting must not cancel the run itself
+        await asyncio.wait({asyncio.shield(handle.task)}, timeout=timeout)
+        return await run_in_db_thread(get_fetch_job, handle.job_id)
+
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + timeout
+    while True:
+        payload = await run_in_db_thread(get_fetch_job, handle.job_id)
+        if payload is None or payload["status"] != JOB_RUNNING or loop.time() >= give_up_at:
+            return payload
+        await asyncio.sleep(JOB_POLL_SECONDS)
+
+
+def get_fetch_job(job_id: str) -> Optional[dict[str, Any]]:
+    """The job as a JSON-ready dict, or None if it doesn't exist."""
+    with Session(engine) as session:
+        job = session.get(FetchJob, job_id)
+        return job_payload(job) if job else None
+
+
+def job_payload(job: FetchJob) -> dict[str, Any]:
+    summary = json.loads(job.summary) if job.summary else None
+    return {
+        "id": job.id,
+        "status": job.status,
+        "started_at": job.started_at.isoformat() + "Z",
+        "finished_at": job.finished_at.isoformat() + "Z" if job.finished_at else None,
+        "duration_seconds": job.duration_seconds,
+        "providers": summary.get("providers", {}) if summary else {},
+        "summary": summary,
+        "error": job.error,
+    }
+
+
+# ── Internals ─────────────────────────────────────────────────────────────────
+
+async def _run_job(job_id: str, connection: Connection, transaction: Transaction) -> None:
+    started = time.perf_counter()
+    try:
+        summary = await run_fetcher()
+    except Exception as exc:
+        logger.exception("Fetch job %s failed", job_id)
+        await run_in_db_thread(
+            _finish_job, job_id, JOB_FAILED, time.perf_counter() - started, error=f"{type(exc).__name__}: {exc}"
+        )
+    else:
+        await run_in_db_thread(
+            _finish_job, job_id, JOB_SUCCEEDED, time.perf_counter() - started, summary=summary.as_dict()
+        )
+        logger.info("Fetch job %s completed in %.2fs", job_id, time.perf_counter() - started)
+    finally:
+        # The row is updated before the lock goes, so whoever takes the lock
+        # next never sees this job as still running.
+        await run_in_db_thread(_release, connection, transaction)
+
+
+def _lock_and_create_job(trigger_ip: str) -> tuple[Optional[Connection], Optional[Transaction], Optional[str]]:
+    """
+    Try the fetch lock on a new connection. Returns (connection, transaction,
+    job id) holding it, or (None, None, None) when another process has it.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        acquired = connection.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": FETCH_LOCK_KEY}
+        ).scalar()
+        job_id = _create_job(trigger_ip) if acquired else None
+    except BaseException:
+        _release(connection, transaction)
+        raise
+    if job_id is None:
+        _release(connection, transaction)
+        return None, None, None
+    return connection, transaction, job_id
+
+
+def _create_job(trigger_ip: str) -> str:
+    """Insert the job row. Only called while holding the fetch lock."""
+    with Session(engine) as session:
+        # Holding the lock means nobody else is running: any "running" row was
+        # left behind by a process that died mid-run.
+        stale = session.exec(select(FetchJob).where(FetchJob.status == JOB_RUNNING)).all()
+        for job in stale:
+            job.status = JOB_FAILED
+            job.error = "Interrupted: the process running this job stopped before it finished."
+            session.add(job)
+
+        job = FetchJob(id=uuid.uuid4().hex, trigger_ip=trigger_ip)
+        session.add(job)
+        session.commit()
+        return job.id
+
+
+def _finish_job(
+    job_id: str,
+    status: str,
+    duration: float,
+    summary: Optional[dict[str, Any]] = None,
+    error: str = "",
+) -> None:
+    with Session(engine) as session:
+        job = session.get(FetchJob, job_id)
+        if not job:
+            return
+        job.status = status
+        job.finished_at = datetime.utcnow()
+        job.duration_seconds = round(duration, 3)
+        job.summary = json.dumps(summary) if summary is not None else None
+        job.error = error
+        session.add(job)
+        session.commit()
+
+
+def _latest_running_job() -> Optional[FetchJob]:
+    with Session(engine) as session:
+        return session.exec(
+            select(FetchJob)
+            .where(FetchJob.status == JOB_RUNNING)
+            .order_by(FetchJob.started_at.desc())
+        ).first()
+
+
+def _release(connection: Connection, transaction: Transaction) -> None:
+    """End the lock-holding transaction (which releases the lock) and return the connection."""
+    try:
+        transaction.rollback()
+    finally:
+        connection.close()
@@ -0,0 +1,93 @@
+"""
+manual_prices.py — Keep the manual_price table in sync with PlatformInfo.manual_prices.
+
+The admin panel edits a platform's manual prices as one JSON object (stored in
+PlatformInfo.manual_prices, which is also what it reads back). Resolving that
+object — parsing it, trying the fintech aliases, converting USD rates to COP —
+used to happen in every price build. It now happens once, when the platform is
+saved: resolve_manual_prices() turns it into one ManualPrice row per coin, and
+build_price_responses() reads those rows with one indexed join.
+
+Every write to PlatformInfo.manual_prices must call sync_manual_prices() in
+the same transaction.
+"""
+
+import json
+from typing import Any, Optional, Union
+
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from app.models import ManualPrice
+from app.services.pricing import parse_price
+
+# Fintechs store their rates under "usd" / "eur" rather than per stablecoin.
+# The alias only applies when the coin has no entry of its own.
+FINTECH_ALIASES = {"usdt": "usd", "usdc": "usd", "euroc": "eur"}
+
+
+def resolve_manual_prices(platform_id: str, category: str, manual_prices: dict[str, Any]) -> list[ManualPrice]:
+    """
+    One ManualPrice per coin priced by `manual_prices`, e.g. for a fintech:
+
+      {"usd": {"active": true, "currency": "COP", "buy": 4160, "sell": 4140},
+       "eur": {"active": true, "currency": "COP", "buy": "N.D.", "sell": "N.D."}}
+
+    gives rows for usd, usdt and usdc (all 4160 / 4140), and for eur and euroc
+    (placeholders: buy_cop / sell_cop stay None).
+
+    Entries with "currency": "USD" hold USD rates; they are converted to COP
+    with the platform's own stable rate (its "usdc", "usd" or "usdt" entry),
+    when that one is active and numeric. Inactive entries are kept, with
+    active=False: they still hide the alias for their coin.
+    """
+    entries = dict(manual_prices)
+    if category == "fintech":
+        for coin, alias in FINTECH_ALIASES.items():
+            if not entries.get(coin) and manual_prices.get(alias):
+                entries[coin] = manual_prices[alias]
+
+    internal_stable = manual_prices.get("usdc") or manual_prices.get("usd") or manual_prices.get("usdt")
+    cop_per_usd: Optional[tuple[float, float]] = None
+    if isinstance(internal_stable, dict) and internal_stable.get("active"):
+        stable_buy, stable_sell = parse_price(internal_stable.get("buy")), parse_price(internal_stable.get("sell"))
+        if stable_buy is not None and stable_sell is not None:
+            cop_per_usd = (stable_buy, stable_sell)
+
+    rows = []
+    for coin, entry in entries.items():
+        if not entry or not isinstance(entry, dict):
+            continue
+        currency = entry.get("currency") or "COP"
+        buy_cop, sell_cop = parse_price(entry.get("buy")), parse_price(entry.get("sell"))
+        if currency == "USD" and cop_per_usd and buy_cop is not None and sell_cop is not None:
+            # e.g. buy=1.005 USD with an internal rate of 4160 COP/USD → 4,180.8 COP
+            buy_cop, sell_cop = buy_cop * cop_per_usd[0], sell_cop * cop_per_usd[1]
+        rows.append(
+            ManualPrice(
+                platform_id=platform_id,
+                coin=coin,
+                currency=currency,
+                buy=_as_text(entry.get("buy")),
+                sell=_as_text(entry.get("sell")),
+                buy_cop=buy_cop,
+                sell_cop=sell_cop,
+                active=bool(entry.get("active")),
+            )
+        )
+    return rows
+
+
+def sync_manual_prices(
+    session: Session, platform_id: str, category: str, manual_prices: Union[str, dict[str, Any], None]
+) -> None:
+    """Replace the platform's manual_price rows; call before committing the platform write."""
+    if isinstance(manual_prices, str):
+        manual_prices = json.loads(manual_prices or "{}")
+    session.execute(delete(ManualPrice).where(ManualPrice.platform_id == platform_id))
+    for row in resolve_manual_prices(platform_id, category, manual_prices or {}):
+        session.add(row)
+
+
+def _as_text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
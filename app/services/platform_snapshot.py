@@ -0,0 +1,112 @@
+"""
+platform_snapshot.py — In-memory GET /api/platforms payloads, per language.
+
+Platforms only change on an admin save or delete, yet every request used to
+load every PlatformInfo row, model_dump() it, parse its manual_prices JSON and
+swap in the English texts. Instead, the payload for every (language, all)
+combination is built once per data version, from one query, and kept encoded
+with its ETag; a request is a dict lookup. The ETag is a hash of the content:
+fetch runs that move a price bump the data version without touching
+platforms, and clients should keep getting 304s across those.
+
+Invalidation is the price snapshot's (app/services/price_snapshot.py):
+save_platform() and delete_platform() bump the data version and call
+data_changed(), which runs invalidate_platform_snapshot() here; the watcher
+does the same for writes made by other workers and instances, and
+PRICE_SNAPSHOT_TTL_SECONDS is the safety net.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.http_cache import content_etag
+from app.core.json_response import encode_json
+from app.db.session import get_async_engine
+from app.i18n import TRANSLATIONS
+from app.models import PlatformInfo
+from app.services.data_version import start_data_version_watcher, subscribe
+
+_LOCALIZABLE_FIELDS = ("funding", "trading", "withdraw", "deposit_networks", "withdraw_networks")
+
+
+@dataclass
+class CachedPlatforms:
+    body: bytes  # {platform_id: platform_item(...)}, encoded
+    etag: str
+
+
+@dataclass
+class PlatformSnapshot:
+    version: int  # local invalidation counter
+    built_at: float  # time.monotonic()
+    payloads: dict[tuple[str, bool], CachedPlatforms]  # by (lang, all)
+
+    def is_current(self, version: int) -> bool:
+        return self.version == version and time.monotonic() - self.built_at < settings.price_snapshot_ttl_seconds
+
+
+_versions = itertools.count(1)
+_version = next(_versions)
+_snapshot: Optional[PlatformSnapshot] = None
+_build_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def invalidate_platform_snapshot() -> None:
+    """Mark the snapshot stale; the next request rebuilds it. Subscribed to data version changes."""
+    global _version
+    _version = next(_versions)
+
+
+def platform_item(platform: PlatformInfo, lang: str) -> dict:
+    """One platform as GET /platforms returns it: manual_prices parsed, texts in `lang`."""
+    item = platform.model_dump()
+    if isinstance(item["manual_prices"], str):
+        item["manual_prices"] = json.loads(item["manual_prices"])
+
+    if lang == "en":
+        for field in _LOCALIZABLE_FIELDS:
+            en_val = (item.get(f"{field}_en") or "").strip()
+            if en_val:
+                item[field] = en_val
+    return item
+
+
+async def get_cached_platforms(lang: str, all: bool) -> CachedPlatforms:
+    """The GET /platforms payload for `lang` (all=True includes inactive platforms)."""
+    start_data_version_watcher()  # no-op once running
+    snapshot = _snapshot
+    if snapshot is None or not snapshot.is_current(_version):
+        lock = _build_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+        async with lock:
+            snapshot = _snapshot
+            if snapshot is None or not snapshot.is_current(_version):
+                snapshot = await _rebuild()
+    return snapshot.payloads[(lang, all)]
+
+
+async def _rebuild() -> PlatformSnapshot:
+    global _snapshot
+    version = _version  # read before the data, see price_snapshot._rebuild_async()
+    async with AsyncSession(get_async_engine()) as session:
+        platforms = list(await session.exec(select(PlatformInfo)))
+
+    payloads = {}
+    for lang in TRANSLATIONS:
+        items = [(platform, platform_item(platform, lang)) for platform in platforms]
+        for all in (False, True):
+            content = {platform.id: item for platform, item in items if all or platform.is_active}
+            payloads[(lang, all)] = CachedPlatforms(body=encode_json(content), etag=content_etag(content))
+    _snapshot = PlatformSnapshot(version=version, built_at=time.monotonic(), payloads=payloads)
+    return _snapshot
+
+
+subscribe(invalidate_platform_snapshot)
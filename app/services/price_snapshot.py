@@ -0,0 +1,209 @@
+"""
+price_snapshot.py — In-memory price responses for GET /api/prices/{coin}.
+
+Prices change when the fetcher commits (every 15 minutes) or an admin saves a
+platform, yet every request used to rebuild its response from the database.
+Instead, the responses for every configured coin are built together (four
+queries, see build_price_responses_async) and served from memory until the data
+changes:
+
+  - invalidate_price_snapshot() bumps the local snapshot version. It runs
+    whenever this process sees a new data version (app/services/data_version.py):
+    after its own commits, and on notifications or polls for writes made by
+    other workers and instances.
+  - As a safety net for a watcher that is off or disconnected, a snapshot is
+    also rebuilt once it is older than PRICE_SNAPSHOT_TTL_SECONDS.
+
+Rebuilds are single-flight: while one request rebuilds (on the event loop,
+with the asyncpg engine), concurrent requests wait for its result instead of
+all querying the database.
+
+Each cached response carries its encoded JSON body and ETag, computed once
+per build: requests are answered with those bytes, and
+conditional requests without touching the body at all.
+
+Responses also carry the data version they were built at ("version"). The
+rows served at the last SNAPSHOT_HISTORY versions are kept, so a client can ask
+for only what changed since the version it holds (price_delta()).
+"""
+
+import asyncio
+import contextlib
+import itertools
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.http_cache import content_etag
+from app.core.json_response import encode_json
+from app.db.session import get_async_engine
+from app.services.data_version import read_data_version_async, start_data_version_watcher, subscribe
+from app.services.pricing import build_price_responses_async
+
+
+# Data versions whose rows are kept for deltas: about a day of 15-minute fetch runs
+SNAPSHOT_HISTORY = 96
+
+
+@dataclass
+class CachedPrice:
+    response: dict  # build_price_response() result plus "version"
+    body: bytes  # response, encoded
+    etag: str
+
+    @classmethod
+    def from_response(cls, response: dict, data_version: int) -> "CachedPrice":
+        response = {**response, "version": data_version}
+        return cls(
+            response=response,
+            body=encode_json(response),
+            etag=content_etag(response),
+        )
+
+
+@dataclass
+class PriceSnapshot:
+    version: int  # local invalidation counter
+    data_version: int  # data_version read before building
+    built_at: float  # time.monotonic()
+    prices: dict[str, CachedPrice]  # by coin
+
+    def is_current(self, version: int) -> bool:
+        return self.version == version and time.monotonic() - self.built_at < settings.price_snapshot_ttl_seconds
+
+
+_versions = itertools.count(1)
+_version = next(_versions)
+_snapshot: Optional[PriceSnapshot] = None
+_async_build_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+_install_lock = threading.Lock()  # held only to swap in a built snapshot, never while building
+# data version → coin → exchange → row, as served at that version
+_history: "OrderedDict[int, dict[str, dict[str, dict]]]" = OrderedDict()
+
+
+def invalidate_price_snapshot() -> None:
+    """Mark the snapshot stale; the next request rebuilds it. Subscribed to data version changes."""
+    global _version
+    _version = next(_versions)
+
+
+async def get_cached_price_async(coin: str) -> CachedPrice:
+    """The response for `coin` with its validators; a current snapshot is served without awaiting anything."""
+    return (await get_cached_prices_async([coin]))[0]
+
+
+async def get_cached_prices_async(coins: list[str]) -> list[CachedPrice]:
+    """
+    get_cached_price_async() for several coins, in order. Configured coins come
+    from the snapshot; others are rare enough to build on demand, in one batch.
+    """
+    start_data_version_watcher()
+    normalized_coins = list(dict.fromkeys(coin.lower() for coin in coins))
+    snapshot = _snapshot
+    if snapshot is None or not snapshot.is_current(_version):
+        snapshot = await _current_snapshot_async()
+    missing = [coin for coin in normalized_coins if coin not in snapshot.prices]
+    extra: dict[str, CachedPrice] = {}
+    if missing:
+        async with _consistent_session() as session:
+            data_version = await read_data_version_async(session) or 0
+            extra = {
+                coin: CachedPrice.from_response(response, data_version)
+                for coin, response in (await build_price_responses_async(session, missing)).items()
+            }
+    return [snapshot.prices.get(coin) or extra[coin] for coin in normalized_coins]
+
+
+def price_delta(cached: CachedPrice, since: int) -> dict[str, Any]:
+    """
+    What changed in a get_cached_price_async() response since data version `since`:
+
+      {"coin", "version", "since", "full": false,
+       "changed":      rows added or whose prices changed (complete rows),
+       "removed":      exchanges no longer listed,
+       "last_updated": {exchange: last_updated} for rows where only that moved}
+
+    Every fetch run refreshes last_updated on every row, so those timestamps are
+    sent apart instead of resending whole rows. When `since` is unknown here
+    (too old, from the future, or an unconfigured coin) the whole list is
+    returned instead, as {"full": true, "prices": [...]}, like the plain endpoint.
+    """
+    current = cached.response
+    base = {"coin": current["coin"], "version": current["version"], "since": since}
+    previous = _history.get(since, {}).get(current["coin"])
+    if previous is None:
+        return {**base, "full": True, "prices": current["prices"]}
+
+    changed, last_updated = [], {}
+    for row in current["prices"]:
+        old = previous.get(row["exchange"])
+        if old is None or _without_timestamp(old) != _without_timestamp(row):
+            changed.append(row)
+        elif old.get("last_updated") != row.get("last_updated"):
+            last_updated[row["exchange"]] = row.get("last_updated")
+    listed = {row["exchange"] for row in current["prices"]}
+    removed = [exchange for exchange in previous if exchange not in listed]
+    return {**base, "full": False, "changed": changed, "removed": removed, "last_updated": last_updated}
+
+
+def _without_timestamp(row: dict) -> dict:
+    return {key: value for key, value in row.items() if key != "last_updated"}
+
+
+async def _current_snapshot_async() -> PriceSnapshot:
+    lock = _async_build_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+    async with lock:
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.is_current(_version):
+            return snapshot
+        return await _rebuild_async()
+
+
+async def _rebuild_async() -> PriceSnapshot:
+    # Read the version before the data: an invalidation that lands mid-build
+    # leaves this snapshot stale, so the next request builds again.
+    version = _version
+    async with _consistent_session() as session:
+        data_version = await read_data_version_async(session) or 0
+        responses = await build_price_responses_async(session, settings.crypto_coins + settings.stable_coins)
+    return _install(version, data_version, responses)
+
+
+@contextlib.asynccontextmanager
+async def _consistent_session() -> AsyncIterator[AsyncSession]:
+    """
+    A session whose reads all see one snapshot of the database (REPEATABLE
+    READ), so responses are labelled with the data version of their rows.
+    Under READ COMMITTED a fetch run committing between the two reads would
+    get rows(N + 1) recorded as version N, and every instance keeps its own
+    history: a client holding rows(N) from another instance would then get
+    an empty delta from this one and miss the N → N + 1 changes.
+    """
+    async with AsyncSession(get_async_engine()) as session:
+        await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        yield session
+
+
+def _install(version: int, data_version: int, responses: dict[str, dict]) -> PriceSnapshot:
+    global _snapshot
+    prices = {coin: CachedPrice.from_response(response, data_version) for coin, response in responses.items()}
+    snapshot = PriceSnapshot(version=version, data_version=data_version, built_at=time.monotonic(), prices=prices)
+    with _install_lock:
+        _snapshot = snapshot
+        # Keep what was first served at each version: that's what clients hold
+        if data_version not in _history:
+            _history[data_version] = {
+                coin: {row["exchange"]: row for row in cached.response["prices"]} for coin, cached in prices.items()
+            }
+            while len(_history) > SNAPSHOT_HISTORY:
+                _history.popitem(last=False)
+    return snapshot
+
+
+subscribe(invalidate_price_snapshot)
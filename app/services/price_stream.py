@@ -0,0 +1,140 @@
+"""
+price_stream.py — Push price updates to connected clients (GET /api/prices/stream).
+
+Instead of polling /api/prices/{coin}, a client keeps one connection open and
+receives an update whenever the data version moves (a fetch run or an admin
+save committed, anywhere — see app/services/data_version.py).
+
+One PriceBroadcaster per worker does the work once per version:
+
+  - the data version watcher calls notify() (from its thread);
+  - the broadcaster reloads the price snapshot once and wakes every subscriber through a single shared asyncio.Event;
+  - each subscriber renders the delta since the version it last sent
+    (price_delta()), memoized per (coins, since), so thousands of subscribers
+    on the same version share one JSON string. No subscriber queries the DB.
+
+Backpressure: nothing is queued per subscriber. A subscriber only holds the
+version it last sent; a client that reads slowly simply skips intermediate
+versions and gets one delta covering all of them when it catches up.
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
+
+from app.core.config import settings
+from app.core.json_response import encode_json
+from app.services.data_version import start_data_version_watcher, subscribe
+from app.services.price_snapshot import CachedPrice, get_cached_prices_async, price_delta
+
+logger = logging.getLogger(__name__)
+
+MAX_MEMOIZED_PAYLOADS = 256  # distinct (coins, since) payloads kept per version
+
+
+class StreamFull(Exception):
+    """PRICE_STREAM_MAX_SUBSCRIBERS clients are already connected to this worker."""
+
+
+class PriceBroadcaster:
+    def __init__(self) -> None:
+        self.subscribers = 0
+        self.version: Optional[int] = None  # data version of self.prices
+        self.prices: dict[str, CachedPrice] = {}  # configured coins, by coin
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None  # replaced (and set) on every publish
+        self._refreshing = False
+        self._dirty = False
+        self._payloads: dict[tuple, str] = {}
+
+    def check_capacity(self) -> None:
+        """Raise StreamFull when this worker can't take another subscriber."""
+        if self.subscribers >= settings.price_stream_max_subscribers:
+            raise StreamFull()
+
+    def notify(self) -> None:
+        """Subscribed to data version changes; called from any thread."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._schedule_refresh)
+
+    async def updates(self, coins: list[str], since: Optional[int]) -> AsyncIterator[tuple[int, Optional[str]]]:
+        """
+        Yield (version, payload) for `coins`: first everything since `since` (all
+        prices when None), then one delta per new version. A payload of None is
+        a keep-alive, yielded after PRICE_STREAM_KEEPALIVE_SECONDS of quiet.
+        """
+        self._bind()
+        start_data_version_watcher()
+        self.subscribers += 1
+        try:
+            while True:
+                if self.version is None:
+                    self._schedule_refresh()  # first subscriber, or the last load failed
+                elif self.version != since:
+                    version = self.version
+                    yield version, self._payload(coins, since)
+                    since = version
+                    continue
+                try:
+                    await asyncio.wait_for(self._changed.wait(), settings.price_stream_keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield since, None
+        finally:
+            self.subscribers -= 1
+
+    # ── Internals (event loop thread only) ────────────────────────────────────
+
+    def _bind(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._changed = asyncio.Event()
+
+    def _schedule_refresh(self) -> None:
+        if self._refreshing:
+            self._dirty = True  # picked up by the running refresh
+            return
+        self._refreshing = True
+        asyncio.ensure_future(self._refresh())
+
+    async def _refresh(self) -> None:
+        try:
+            while True:
+                self._dirty = False
+                coins = settings.crypto_coins + settings.stable_coins
+                cached = await get_cached_prices_async(coins)
+                self._publish({entry.response["coin"]: entry for entry in cached})
+                if not self._dirty:
+                    break
+        except Exception:
+            logger.exception("Price stream refresh failed")
+        finally:
+            self._refreshing = False
+
+    def _publish(self, prices: dict[str, CachedPrice]) -> None:
+        version = max(entry.response["version"] for entry in prices.values())
+        if version == self.version:
+            return
+        self.prices, self.version = prices, version
+        self._payloads = {}
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _payload(self, coins: list[str], since: Optional[int]) -> str:
+        key = (tuple(coins), since)
+        payload = self._payloads.get(key)
+        if payload is None:
+            entries = [self.prices[coin] for coin in coins]
+            body = {
+                "version": self.version,
+                "coins": [entry.response if since is None else price_delta(entry, since) for entry in entries],
+            }
+            payload = encode_json(body).decode()
+            if len(self._payloads) < MAX_MEMOIZED_PAYLOADS:
+                self._payloads[key] = payload
+        return payload
+
+
+price_broadcaster = PriceBroadcaster()
+subscribe(price_broadcaster.notify)
@@ -4,19 +4,25 @@ pricing.py — Build the price response served to the frontend.
 This module assembles the data returned by GET /api/prices/{coin}.
 It combines two sources:
   1. Prices fetched automatically by the fetcher (stored in CryptoPrice / StablecoinPrice tables).
-  2. Prices entered manually in the admin panel (stored in PlatformInfo.manual_prices as JSON).
+  2. Prices entered manually in the admin panel (stored in PlatformInfo.manual_prices as JSON,
+     and resolved into the ManualPrice table when saved — see app/services/manual_prices.py).
 
 Manual prices exist for platforms that don't have a public API (e.g. some fintechs).
 """
 
-import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Optional
 
 from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.models import CryptoPrice, PlatformInfo, StablecoinPrice
+from app.models import CryptoPrice, ManualPrice, PlatformInfo, ProviderHeartbeat, StablecoinPrice
+
+# How price timestamps (timestamptz in the DB) appear in responses
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S UTC"
 
 
 def parse_price(value) -> Optional[float]:
@@ -38,6 +44,11 @@ def parse_price(value) -> Optional[float]:
         return None
 
 
+def format_timestamp(value: Optional[datetime]) -> Optional[str]:
+    """A DB timestamp as served to the frontend: "2024-04-03 15:00:00 UTC"."""
+    return value.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT) if value else None
+
+
 def build_price_response(session: Session, coin: str):
     """
     Build the full price list for a given coin, combining DB prices and manual overrides.
@@ -69,139 +80,163 @@ def build_price_response(session: Session, coin: str):
     If a platform has a manual price that's active, it's appended at the end
     (unless a fetched price already exists for that exchange — no duplicates).
     """
-    normalized_coin = coin.lower()
-    results = []
-
-    # ── Step 1: Load all active platforms ────────────────────────────────────
-    # We need the full platform list to:
-    #   a) filter fetched prices (only include active exchanges)
-    #   b) inject manual prices for platforms that don't have API prices
-    platforms = [
-        platform.model_dump()
-        for platform in session.exec(select(PlatformInfo).where(PlatformInfo.is_active))
-    ]
-    # Build a set of active exchange IDs for fast filtering below
-    active_ids = [platform["id"] for platform in platforms]
+    return build_price_responses(session, [coin])[coin.lower()]
 
-    # ── Step 2: Load automatically fetched prices from the DB ─────────────────
-    # Stablecoins (usdt, usdc, euroc) are in a separate table from volatile coins (btc, eth, …)
-    price_model = StablecoinPrice if normalized_coin in settings.stable_coins else CryptoPrice
+
+def build_price_responses(session: Session, coins: list[str]) -> dict[str, dict]:
+    """
+    Same as build_price_response(), for several coins at once: {coin: response}.
+
+    Active platform ids, heartbeats, each price table and the manual prices
+    are read once for all coins (five queries in total), which is what the
+    price snapshot builds from.
+    """
+    queries = PriceQueries.for_coins(coins)
+    active_ids = set(session.exec(queries.active_ids()))
+    heartbeats, prices = [], []
     try:
-        prices = session.exec(select(price_model).where(price_model.coin == normalized_coin))
-        for price in prices:
-            row = price.model_dump()
-            # Only include this price if the exchange is currently active
-            if row["exchange"] in active_ids:
-                results.append(row)
+        heartbeats = session.exec(queries.heartbeats()).all()
+        for statement in queries.prices():
+            prices.extend(session.exec(statement))
     except SQLAlchemyError as exc:
         # Log DB errors but return whatever partial results we have
-        print(f"DB error querying {normalized_coin} prices: {exc}")
+        print(f"DB error querying {', '.join(queries.coins)} prices: {exc}")
+        session.rollback()
+    manual = session.exec(queries.manual()).all()
+    return queries.assemble(active_ids, heartbeats, prices, manual)
+
+
+async def build_price_responses_async(session: AsyncSession, coins: list[str]) -> dict[str, dict]:
+    """build_price_responses() on an AsyncSession, for the async request handlers."""
+    queries = PriceQueries.for_coins(coins)
+    active_ids = set(await session.exec(queries.active_ids()))
+    heartbeats, prices = [], []
+    try:
+        heartbeats = (await session.exec(queries.heartbeats())).all()
+        for statement in queries.prices():
+            prices.extend(await session.exec(statement))
+    except SQLAlchemyError as exc:
+        print(f"DB error querying {', '.join(queries.coins)} prices: {exc}")
+        await session.rollback()
+    manual = (await session.exec(queries.manual())).all()
+    return queries.assemble(active_ids, heartbeats, prices, manual)
+
+
+@dataclass
+class PriceQueries:
+    """
+    The statements behind a price build for `coins`, and assemble() to turn
+    their rows into responses. Shared by the sync and async builders, which
+    only differ in how they run the statements.
+    """
+    coins: list[str]  # lowercased, without duplicates
+
+    @classmethod
+    def for_coins(cls, coins: list[str]) -> "PriceQueries":
+        return cls(list(dict.fromkeys(coin.lower() for coin in coins)))
+
+    # ── Step 1: Load the active platform ids ─────────────────────────────────
+    # Fetched prices are only included for exchanges that are currently active
+    def active_ids(self):
+        return select(PlatformInfo.id).where(PlatformInfo.is_active)
+
+    # ── Step 2: Load automatically fetched prices from the DB ─────────────────
+    # The fetcher only rewrites a price row when the price moves; the time the
+    # provider last reported each (exchange, coin) lives in provider_heartbeat,
+    # one row per provider listing the coins it reported. Report whichever is
+    # newer so unchanged prices don't look stale.
+    def heartbeats(self):
+        return select(ProviderHeartbeat).where(ProviderHeartbeat.coins.overlap(self.coins))
+
+    def prices(self) -> list:
+        # Stablecoins (usdt, usdc, euroc) are in a separate table from volatile coins (btc, eth, …)
+        stable = [coin for coin in self.coins if coin in settings.stable_coins]
+        crypto = [coin for coin in self.coins if coin not in settings.stable_coins]
+        return [
+            select(price_model).where(price_model.coin.in_(model_coins))
+            for price_model, model_coins in ((StablecoinPrice, stable), (CryptoPrice, crypto))
+            if model_coins
+        ]
 
     # ── Step 3: Inject manual prices ─────────────────────────────────────────
-    # Some platforms (like fintechs) don't have public APIs.
-    # An admin enters their rates manually in the admin panel.
-    # Those rates are stored in PlatformInfo.manual_prices as a JSON blob.
-    #
-    # Example manual_prices structure stored in the DB:
-    # {
-    #   "usd": {
-    #     "active": true,
-    #     "currency": "USD",   ← means the buy/sell values below are in USD, not COP
-    #     "buy": 1.005,        ← cost in USD to buy 1 USD-equivalent stablecoin
-    #     "sell": 0.995        ← USD received when selling
-    #   },
-    #   "eur": {
-    #     "active": true,
-    #     "currency": "EUR",
-    #     "buy": 1.01,
-    #     "sell": 0.99
-    #   }
-    # }
-    for platform in platforms:
-        # Skip platforms that use automatic fetching (not manual entry)
-        if not platform["is_manual"]:
-            continue
-
-        # manual_prices may be stored as a raw JSON string or already parsed as a dict
-        manual_prices = platform["manual_prices"]
-        if isinstance(manual_prices, str):
-            manual_prices = json.loads(manual_prices)
-
-        # Look up the entry for this specific coin
-        target_data = manual_prices.get(normalized_coin)
-
-        # Fintechs store rates under "usd" / "eur" keys, not "usdt" / "usdc" / "euroc".
-        # If we didn't find a direct match, try the currency aliases.
-        if not target_data and platform["category"] == "fintech":
-            if normalized_coin in ["usdc", "usdt"]:
-                target_data = manual_prices.get("usd")
-            elif normalized_coin == "euroc":
-                target_data = manual_prices.get("eur")
-
-        # Skip if this coin has no manual entry, or if the entry is marked inactive
-        if not target_data or not target_data.get("active"):
-            continue
-
-        raw_buy = target_data.get("buy")
-        raw_sell = target_data.get("sell")
-        buy_val = parse_price(raw_buy)
-        sell_val = parse_price(raw_sell)
-
-        is_usd = target_data.get("currency") == "USD"
-
-        # Allow manual placeholder strings such as "N.D." to surface in the UI
-        # instead of silently dropping the platform from the response.
-        if buy_val is None or sell_val is None:
-            if not any(result["exchange"] == platform["id"] for result in results):
-                results.append(
-                    {
-                        "exchange": platform["id"],
-                        "buy_cop": raw_buy,
-                        "sell_cop": raw_sell,
-                        "buy_usd": raw_buy if is_usd else raw_buy,
-                        "sell_usd": raw_sell if is_usd else raw_sell,
-                        "spread": 0,
-                        "direct_cop": not is_usd,
-                        "usd_bridge": "",
-                        "last_updated": platform.get("last_updated"),
-                    }
-                )
-            continue
-
-        if is_usd:
-            # The manual entry stores a USD rate (not COP).
-            # We need to convert it to COP using the platform's own stable coin rate.
-            #
-            # Example: platform manually entered buy=1.005 USD for USDT.
-            # Their internal USD/COP rate (from "usdc" or "usd" entry) is buy=4160, sell=4140.
-            # Final COP buy price = 1.005 × 4160 = 4,180.8 COP
-            internal_stable = (
-                manual_prices.get("usdc")
-                or manual_prices.get("usd")
-                or manual_prices.get("usdt")
-            )
-            if internal_stable and internal_stable.get("active"):
-                trm_i_buy  = parse_price(internal_stable.get("buy"))
-                trm_i_sell = parse_price(internal_stable.get("sell"))
-                if trm_i_buy is not None and trm_i_sell is not None:
-                    buy_val  = buy_val  * trm_i_buy    # USD price × COP/USD = COP price
-                    sell_val = sell_val * trm_i_sell
-
-        # Only append if this exchange doesn't already have a fetched price in results
-        # (fetched prices take priority over manual entries)
-        if not any(result["exchange"] == platform["id"] for result in results):
-            results.append(
-                {
-                    "exchange":    platform["id"],
-                    "buy_cop":     buy_val,
-                    "sell_cop":    sell_val,
-                    "buy_usd":     raw_buy if is_usd else 0,
-                    "sell_usd":    raw_sell if is_usd else 0,
-                    "spread":      0,         # spread not calculated for manual entries
-                    "direct_cop":  not is_usd,
-                    "usd_bridge":  "USDC" if is_usd else "",
-                    "last_updated": platform.get("last_updated"),
-                }
-            )
-
-    return {"coin": normalized_coin, "prices": results}
+    # Some platforms (like fintechs) don't have public APIs. An admin enters
+    # their rates in the admin panel, and saving the platform resolves them
+    # into ManualPrice rows: fintech aliases ("usd" → usdt/usdc, "eur" → euroc)
+    # are expanded and USD rates converted to COP at that point, so this is a
+    # single join on manual_price.coin.
+    def manual(self):
+        return (
+            select(ManualPrice, PlatformInfo.last_updated)
+            .join(PlatformInfo, PlatformInfo.id == ManualPrice.platform_id)
+            .where(ManualPrice.coin.in_(self.coins), ManualPrice.active, PlatformInfo.is_manual, PlatformInfo.is_active)
+            .order_by(ManualPrice.platform_id)
+        )
+
+    def assemble(self, active_ids: set[str], heartbeats, prices, manual) -> dict[str, dict]:
+        """{coin: response} from the rows of the statements above."""
+        last_checked = {
+            (heartbeat.exchange, coin): heartbeat.last_checked for heartbeat in heartbeats for coin in heartbeat.coins
+        }
+        rows_by_coin: dict[str, list[dict]] = {coin: [] for coin in self.coins}
+        for price in prices:
+            # Only include this price if the exchange is currently active
+            if price.exchange not in active_ids:
+                continue
+            row = price.model_dump()
+            checked = last_checked.get((row["exchange"], row["coin"]))
+            if checked and (row["last_updated"] is None or checked > row["last_updated"]):
+                row["last_updated"] = checked
+            row["last_updated"] = format_timestamp(row["last_updated"])
+            rows_by_coin[row["coin"]].append(row)
+
+        manual_by_coin: dict[str, list[dict]] = {coin: [] for coin in self.coins}
+        for price, last_updated in manual:
+            manual_by_coin[price.coin].append(manual_price_row(price, last_updated))
+
+        responses = {}
+        for coin in self.coins:
+            results = rows_by_coin[coin]
+            taken = {result["exchange"] for result in results}
+            # Fetched prices take priority over manual entries for the same exchange
+            results.extend(row for row in manual_by_coin[coin] if row["exchange"] not in taken)
+            responses[coin] = {"coin": coin, "prices": results}
+        return responses
+
+
+def manual_price_row(price: ManualPrice, last_updated: Optional[str]) -> dict:
+    """The response row for one ManualPrice; `last_updated` is the platform's."""
+    is_usd = price.currency == "USD"
+
+    # Allow manual placeholder strings such as "N.D." to surface in the UI
+    # instead of silently dropping the platform from the response.
+    if price.buy_cop is None or price.sell_cop is None:
+        buy = _number_or_text(price.buy)
+        sell = _number_or_text(price.sell)
+        return {
+            "exchange": price.platform_id,
+            "buy_cop": buy,
+            "sell_cop": sell,
+            "buy_usd": buy,
+            "sell_usd": sell,
+            "spread": 0,
+            "direct_cop": not is_usd,
+            "usd_bridge": "",
+            "last_updated": last_updated,
+        }
+
+    return {
+        "exchange":    price.platform_id,
+        "buy_cop":     price.buy_cop,    # already converted to COP when saved
+        "sell_cop":    price.sell_cop,
+        "buy_usd":     parse_price(price.buy) if is_usd else 0,
+        "sell_usd":    parse_price(price.sell) if is_usd else 0,
+        "spread":      0,                # spread not calculated for manual entries
+        "direct_cop":  not is_usd,
+        "usd_bridge":  "USDC" if is_usd else "",
+        "last_updated": last_updated,
+    }
+
+
+def _number_or_text(value: Optional[str]):
+    number = parse_price(value)
+    return value if number is None else number
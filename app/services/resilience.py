@@ -0,0 +1,153 @@
+"""
+resilience.py — Per-provider health for the fetcher: adaptive timeouts,
+retry/backoff policy and circuit breakers.
+
+Every outbound fetcher request is made on behalf of one provider ("binance",
+"buda", …). For each provider we remember:
+  - recent latencies → the timeout is a multiple of their 95th percentile, so a
+    provider that normally answers in 200 ms doesn't get to hang for 10 s;
+  - consecutive failures → after FETCH_BREAKER_THRESHOLD of them the breaker
+    opens and the provider is skipped without a request for
+    FETCH_BREAKER_COOLDOWN_SECONDS. After that it is half-open: each run may
+    send one probe request, and the provider's other requests are still
+    skipped. A successful probe closes the breaker, a failed one opens it
+    again right away. At most one failure counts per fetch run: a provider
+    that sends several requests in parallel would otherwise trip its breaker
+    on one bad run.
+
+State lives in the process, so it carries across runs on a long-lived worker
+and across warm invocations on serverless; a cold start begins with every
+breaker closed.
+"""
+
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import httpx
+
+from app.core.config import settings
+
+# Status codes worth retrying: rate limiting and transient upstream failures.
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+LATENCY_WINDOW = 20          # latencies kept per provider
+MIN_LATENCY_SAMPLES = 5      # below this the default timeout is used
+TIMEOUT_P95_MULTIPLIER = 4.0
+MIN_TIMEOUT_SECONDS = 2.0
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_MAX_SECONDS = 4.0
+
+
+class CircuitOpen(Exception):
+    """Raised instead of sending a request to a provider whose breaker is open."""
+
+
+@dataclass
+class ProviderHealth:
+    """Rolling latency and failure state for one provider."""
+    name: str
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    consecutive_failures: int = 0
+    open_until: float = 0.0  # time.monotonic() until which the breaker stays open
+    failed_run: Optional[int] = None  # run that last counted a failure
+    probe_run: Optional[int] = None  # run that last sent the half-open probe
+
+    def latency_p95(self) -> Optional[float]:
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def timeout(self, ceiling: float) -> float:
+        """Adaptive timeout: p95 × TIMEOUT_P95_MULTIPLIER within [MIN_TIMEOUT_SECONDS, ceiling]."""
+        p95 = self.latency_p95()
+        if p95 is None:
+            return ceiling
+        return max(MIN_TIMEOUT_SECONDS, min(ceiling, p95 * TIMEOUT_P95_MULTIPLIER))
+
+    @property
+    def state(self) -> str:
+        if self.consecutive_failures < settings.fetch_breaker_threshold:
+            return "closed"
+        return "open" if time.monotonic() < self.open_until else "half_open"
+
+    def allow_request(self, run_id: Optional[int] = None) -> bool:
+        """
+        Whether a request may be sent. Closed: always. Open: never. Half-open:
+        only the first request of run `run_id`, the probe (None: outside a
+        run, every request is a probe).
+        """
+        state = self.state
+        if state != "half_open":
+            return state == "closed"
+        if run_id is not None and run_id == self.probe_run:
+            return False
+        self.probe_run = run_id
+        return True
+
+    def record_success(self, latency: Optional[float] = None) -> None:
+        if latency is not None:
+            self.latencies.append(latency)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self, run_id: Optional[int] = None) -> None:
+        """
+        Count a failure, unless run `run_id` already counted one (None: always
+        count). A failed half-open probe always counts, so the breaker opens again.
+        """
+        probe_failed = self.state == "half_open"
+        if run_id is not None:
+            if run_id == self.failed_run and not probe_failed:
+                return
+            self.failed_run = run_id
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= settings.fetch_breaker_threshold:
+            self.open_until = time.monotonic() + settings.fetch_breaker_cooldown_seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        p95 = self.latency_p95()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_p95": round(p95, 3) if p95 is not None else None,
+            "reopens_in": round(max(0.0, self.open_until - time.monotonic()), 1) if self.state == "open" else 0,
+        }
+
+
+_providers: dict[str, ProviderHealth] = {}
+
+
+def get_provider_health(name: str) -> ProviderHealth:
+    if name not in _providers:
+        _providers[name] = ProviderHealth(name)
+    return _providers[name]
+
+
+def provider_health_snapshot() -> dict[str, dict[str, Any]]:
+    """{provider: ProviderHealth.as_dict()} for every provider seen so far."""
+    return {name: health.as_dict() for name, health in sorted(_providers.items())}
+
+
+def is_retryable_error(exc: Exception) -> bool:
+    """Timeouts and connection-level errors are transient; anything else is not."""
+    return isinstance(exc, httpx.TransportError)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based).
+
+    Exponential backoff with full jitter: uniform(0, base × 2^attempt), capped
+    at BACKOFF_MAX_SECONDS. A numeric Retry-After header wins when it is within the cap.
+    """
+    try:
+        requested = float(retry_after) if retry_after else None
+    except ValueError:
+        requested = None
+    if requested is not None and 0 <= requested <= BACKOFF_MAX_SECONDS:
+        return requested
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
@@ -0,0 +1,160 @@
+"""
+async_routes.py — Throughput and latency of the read routes, sync (threadpool) vs. async (asyncpg).
+
+Run against the database configured in .env (reads only):
+  .venv/bin/python3 benchmarks/async_routes.py [--seconds 5] [--concurrency 200]
+
+Starts each version of the routes in a uvicorn subprocess (one worker) and
+drives it with `--concurrency` concurrent httpx clients:
+  sync  — the previous handlers: plain `def` routes that FastAPI runs on its
+          threadpool, with a Session from the sync engine (the price route
+          reads the same snapshot, called back on the event loop)
+  async — the real app: `async def` routes on the asyncpg engine
+for GET /api/prices/{coin} (served from the price snapshot) and GET
+/api/platforms (sync: loaded per request; async: from the platform snapshot).
+Both snapshots are rebuilt every --invalidate-every requests. Prints req/s and
+p50/p99 latency for each.
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from anyio.from_thread import run as run_on_event_loop
+from fastapi import Depends, FastAPI, Request
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.db.migrations import run_migrations
+from app.db.session import get_session
+from app.i18n import get_lang
+from app.main import app as async_app
+from app.models import PlatformInfo
+from app.services.data_version import read_data_version
+from app.services.platform_snapshot import invalidate_platform_snapshot, platform_item
+from app.services.price_snapshot import get_cached_price_async, invalidate_price_snapshot
+
+COINS = settings.crypto_coins + settings.stable_coins
+
+# ── Sync handlers, as they were before the async engine ───────────────────────
+
+sync_app = FastAPI()
+
+
+@sync_app.get("/api/prices/{coin}")
+def sync_prices(coin: str):
+    return run_on_event_loop(get_cached_price_async, coin).response
+
+
+@sync_app.get("/api/platforms")
+def sync_platforms(request: Request, session: Session = Depends(get_session)):
+    lang = get_lang(request)
+    read_data_version(session)
+    statement = select(PlatformInfo).where(PlatformInfo.is_active == True)
+    return {platform.id: platform_item(platform, lang) for platform in session.exec(statement)}
+
+
+def bench_invalidate() -> None:
+    # What a data version change does, in the server process
+    invalidate_price_snapshot()
+    invalidate_platform_snapshot()
+
+
+for bench_app in (sync_app, async_app):
+    bench_app.post("/bench/invalidate")(bench_invalidate)
+
+
+# ── Load generator ────────────────────────────────────────────────────────────
+
+
+SERVERS = {
+    "sync": ["async_routes:sync_app", "--app-dir", os.path.dirname(os.path.abspath(__file__))],
+    "async": ["async_routes:async_app", "--app-dir", os.path.dirname(os.path.abspath(__file__))],
+}
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", *SERVERS[mode], "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.join(os.path.dirname(__file__), ".."),
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/prices/{COINS[0]}").raise_for_status()
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError(f"uvicorn ({mode}) did not start on port {port}")
+
+
+async def measure(label: str, port: int, path_for, seconds: float, concurrency: int, invalidate_every: int) -> None:
+    latencies: list[float] = []
+    counter = itertools.count()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+        await client.get(path_for(0))  # warm up (connection pool, first snapshot build)
+        stop_at = time.perf_counter() + seconds
+
+        async def worker() -> None:
+            while time.perf_counter() < stop_at:
+                index = next(counter)
+                if invalidate_every and index % invalidate_every == 0:
+                    await client.post("/bench/invalidate")
+                started = time.perf_counter()
+                response = await client.get(path_for(index))
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:<22} {len(latencies) / elapsed:8.0f} req/s  "
+        f"p50={statistics.median(latencies) * 1000:8.2f} ms  "
+        f"p99={p99 * 1000:8.2f} ms"
+    )
+
+
+async def main_async(args) -> None:
+    routes = [
+        ("prices", lambda index: f"/api/prices/{COINS[index % len(COINS)]}"),
+        ("platforms", lambda index: "/api/platforms"),
+    ]
+    for mode in SERVERS:
+        server = start_server(mode, args.port)
+        try:
+            for name, path_for in routes:
+                await measure(
+                    f"{name} {mode}", args.port, path_for, args.seconds, args.concurrency, args.invalidate_every
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--invalidate-every", type=int, default=500, help="requests between snapshot rebuilds (0: never)")
+    args = parser.parse_args()
+
+    run_migrations()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
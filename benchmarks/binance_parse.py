@@ -0,0 +1,133 @@
+"""
+binance_parse.py — Peak memory and parse time of the Binance provider paths.
+
+Run (no network or database needed; the payload is synthetic):
+  .venv/bin/python3 benchmarks/binance_parse.py [--symbols 3000] [--repeat 5]
+
+Compares three ways of getting the tickers for TARGET_COINS:
+  full     — download the whole bookTicker dump and json.loads it (old path)
+  stream   — the whole dump again, scanned as it streams, decoding only candidates
+  filtered — the ?symbols=[...] request used while the symbol list is cached
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+
+from app.fetcher import (
+    BINANCE_BOOK_TICKER_URL,
+    binance_candidate_symbols,
+    request_json,
+    stream_filtered_objects,
+)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_dump(total_symbols: int) -> list[dict]:
+    """A bookTicker-shaped list: every real candidate plus filler symbols."""
+    tickers = [
+        {"symbol": symbol, "bidPrice": "100.00", "bidQty": "1.0", "askPrice": "100.10", "askQty": "1.0"}
+        for symbol in binance_candidate_symbols()[:20]
+    ]
+    for index in range(total_symbols - len(tickers)):
+        tickers.append(
+            {
+                "symbol": f"FILL{index:05d}USDT",
+                "bidPrice": "0.12345678",
+                "bidQty": "12345.00000000",
+                "askPrice": "0.12345679",
+                "askQty": "54321.00000000",
+            }
+        )
+    return tickers
+
+
+def make_transport(dump_body: bytes, tickers: list[dict]) -> httpx.MockTransport:
+    async def chunks():
+        for start in range(0, len(dump_body), CHUNK_SIZE):
+            yield dump_body[start:start + CHUNK_SIZE]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if "symbols" in request.url.params:
+            wanted = set(json.loads(request.url.params["symbols"]))
+            return httpx.Response(200, json=[item for item in tickers if item["symbol"] in wanted])
+        return httpx.Response(200, content=chunks())
+
+    return httpx.MockTransport(handler)
+
+
+async def run_full(client: httpx.AsyncClient) -> dict:
+    data = await request_json(client, BINANCE_BOOK_TICKER_URL, exchange="binance")
+    return {item.get("symbol"): item for item in data}
+
+
+async def run_stream(client: httpx.AsyncClient) -> dict:
+    data = await stream_filtered_objects(
+        client,
+        BINANCE_BOOK_TICKER_URL,
+        exchange="binance",
+        field="symbol",
+        wanted=set(binance_candidate_symbols()),
+    )
+    return {item.get("symbol"): item for item in data}
+
+
+async def run_filtered(client: httpx.AsyncClient) -> dict:
+    symbols = binance_candidate_symbols()[:20]
+    data = await request_json(
+        client,
+        BINANCE_BOOK_TICKER_URL,
+        exchange="binance",
+        params={"symbols": json.dumps(symbols, separators=(",", ":"))},
+    )
+    return {item.get("symbol"): item for item in data}
+
+
+async def measure(label: str, func, transport: httpx.MockTransport, repeat: int) -> None:
+    timings, peaks = [], []
+    found = 0
+    for _ in range(repeat):
+        async with httpx.AsyncClient(transport=transport) as client:
+            started = time.perf_counter()
+            found = len(await func(client))
+            timings.append(time.perf_counter() - started)
+        # Memory is measured in a separate pass: tracemalloc slows allocation down
+        async with httpx.AsyncClient(transport=transport) as client:
+            tracemalloc.start()
+            await func(client)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    print(
+        f"{label:<9} symbols_kept={found:<3} median={statistics.median(timings) * 1000:7.1f} ms "
+        f"peak={max(peaks) / 1024 / 1024:6.2f} MiB"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tickers = build_dump(args.symbols)
+    dump_body = json.dumps(tickers).encode()
+    print(f"payload: {len(tickers)} symbols, {len(dump_body) / 1024 / 1024:.2f} MiB")
+
+    transport = make_transport(dump_body, tickers)
+    await measure("full", run_full, transport, args.repeat)
+    await measure("stream", run_stream, transport, args.repeat)
+    await measure("filtered", run_filtered, transport, args.repeat)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
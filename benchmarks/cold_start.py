@@ -0,0 +1,91 @@
+"""
+cold_start.py — Time from process start to the first /api/prices/btc byte.
+
+Run against the database configured in .env:
+  .venv/bin/python3 benchmarks/cold_start.py [--runs 5] [--budget-ms 2500] [--profile]
+
+Each run starts a fresh `uvicorn index:app` process (the same entry point as
+Vercel, with VERCEL=1 so the serverless startup path is used) and polls
+/api/prices/btc until the first response byte arrives. Prints every run and
+the median, and exits with status 1 when the median is over --budget-ms.
+
+--profile sets STARTUP_PROFILE=1 for the first run and shows its import
+profile (see startup_profile.py).
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+POLL_SECONDS = 0.005
+GIVE_UP_SECONDS = 30.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def first_byte(port: int) -> bool:
+    """Send one GET and wait for the first byte of the answer; False if nobody listens yet."""
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=GIVE_UP_SECONDS) as sock:
+            sock.sendall(b"GET /api/prices/btc HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n")
+            return bool(sock.recv(1))
+    except ConnectionRefusedError:
+        return False
+
+
+def cold_start(profile: bool) -> float:
+    port = free_port()
+    env = dict(os.environ, VERCEL="1")
+    if profile:
+        env["STARTUP_PROFILE"] = "1"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "index:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+        stdout=None if profile else subprocess.DEVNULL,
+    )
+    try:
+        while not first_byte(port):
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+            if time.perf_counter() - started > GIVE_UP_SECONDS:
+                raise RuntimeError("no response within the give-up time")
+            time.sleep(POLL_SECONDS)
+        return time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2500)
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    timings = []
+    for run in range(args.runs):
+        seconds = cold_start(profile=args.profile and run == 0)
+        timings.append(seconds)
+        print(f"run {run + 1}: {seconds * 1000:7.1f} ms")
+
+    median_ms = statistics.median(timings) * 1000
+    verdict = "within" if median_ms <= args.budget_ms else "OVER"
+    print(f"median {median_ms:.1f} ms — {verdict} the {args.budget_ms:.0f} ms budget")
+    if median_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
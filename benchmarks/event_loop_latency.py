@@ -0,0 +1,129 @@
+"""
+event_loop_latency.py — /api/prices latency while a fetch run is writing.
+
+Run against the database configured in .env:
+  .venv/bin/python3 benchmarks/event_loop_latency.py [--rows 2000] [--clients 4]
+
+Runs run_fetcher() (with provider collection replaced by synthetic records, so
+no network is needed) while `--clients` concurrent callers hit
+/api/prices/btc through the ASGI app on the same event loop, once with the DB
+phase inline on the loop (the old behaviour) and once on the background DB
+thread. For each mode it prints the worst event-loop stall and the p50/max
+latency of the price requests made during the run.
+
+The synthetic rows (exchange "bench*") are deleted again at the end.
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from sqlalchemy import delete
+from sqlmodel import Session
+
+import app.fetcher as fetcher
+from app.db.migrations import run_migrations
+from app.db.session import engine
+from app.main import app
+from app.models import CryptoPrice, ProviderHeartbeat, StablecoinPrice
+
+TICK_SECONDS = 0.005
+
+
+def build_records(rows: int, run: int):
+    """Synthetic records spread over TARGET_COINS; prices differ per run so every row is written."""
+    return [
+        fetcher.build_price_record(
+            exchange=f"bench{index // len(fetcher.TARGET_COINS)}",
+            coin=fetcher.TARGET_COINS[index % len(fetcher.TARGET_COINS)],
+            buy_cop=4160.0 + index + run,
+            sell_cop=4140.0 + index + run,
+            last_updated=datetime.datetime(2024, 4, 3, 15, tzinfo=datetime.timezone.utc),
+        )
+        for index in range(rows)
+    ]
+
+
+async def inline_db(func, *args, **kwargs):
+    """The old behaviour: blocking DB calls straight on the event loop."""
+    return func(*args, **kwargs)
+
+
+async def watch_loop(stop: asyncio.Event, stalls: list[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(TICK_SECONDS)
+        stalls.append(loop.time() - started - TICK_SECONDS)
+
+
+async def hit_prices(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/prices/btc")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def measure(label: str, rows: int, clients: int, run: int) -> None:
+    async def collect_synthetic(summary=None, deadline=None):
+        await asyncio.sleep(0.05)
+        return build_records(rows, run)
+
+    fetcher.collect_prices = collect_synthetic
+
+    stop = asyncio.Event()
+    stalls: list[float] = []
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/api/prices/btc")  # warm up the connection pool
+        background = [asyncio.create_task(watch_loop(stop, stalls))]
+        background += [asyncio.create_task(hit_prices(client, stop, latencies)) for _ in range(clients)]
+        started = time.perf_counter()
+        await fetcher.run_fetcher()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*background)
+
+    print(
+        f"{label:<9} run={elapsed * 1000:7.1f} ms  max_loop_stall={max(stalls) * 1000:7.1f} ms  "
+        f"prices p50={statistics.median(latencies) * 1000:6.1f} ms max={max(latencies) * 1000:7.1f} ms "
+        f"(n={len(latencies)})"
+    )
+
+
+def cleanup() -> None:
+    with Session(engine) as session:
+        for model in (CryptoPrice, StablecoinPrice, ProviderHeartbeat):
+            session.exec(delete(model).where(model.exchange.like("bench%")))
+        session.commit()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=4)
+    args = parser.parse_args()
+
+    run_migrations()
+    run_in_db_thread = fetcher.run_in_db_thread
+    try:
+        fetcher.run_in_db_thread = inline_db
+        await measure("inline", args.rows, args.clients, run=0)
+        fetcher.run_in_db_thread = run_in_db_thread
+        await measure("executor", args.rows, args.clients, run=1)
+    finally:
+        fetcher.run_in_db_thread = run_in_db_thread
+        cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
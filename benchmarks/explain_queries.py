@@ -0,0 +1,141 @@
+"""
+explain_queries.py — Check that the pricing and platform reads can use their indexes.
+
+Run against the database configured in .env (everything is rolled back):
+  .venv/bin/python3 benchmarks/explain_queries.py [--exchanges 200] [--verbose]
+
+EXPLAINs the statements that build_price_response() (one coin) and
+GET /api/platforms run, plus a freshness query on last_updated, and checks each
+plan reads the expected index. Exits with status 1 if any of them falls back
+to a sequential scan or another index. (The snapshot build reads every coin
+at once; a sequential scan is the right plan there.)
+
+The check is about tables that have grown, so it first adds prices for
+--exchanges synthetic exchanges and ANALYZEs, inside a transaction that is
+rolled back at the end. Plans are taken with enable_seqscan off: a sequential
+scan may still be cheapest, and the question is which index serves the query.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+
+from app.core.config import settings
+from app.db.migrations import ensure_schema_current
+from app.db.session import engine
+from app.models import CryptoPrice, ManualPrice, PlatformInfo, StablecoinPrice
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+STALE_AFTER = datetime.timedelta(hours=1)
+
+# (description, statement, table, expected index)
+CHECKS = [
+    (
+        "crypto prices by coin",
+        select(CryptoPrice).where(CryptoPrice.coin.in_(["btc"])),
+        "crypto_prices",
+        "ix_crypto_prices_coin_exchange",
+    ),
+    (
+        "stablecoin prices by coin",
+        select(StablecoinPrice).where(StablecoinPrice.coin.in_(["usdt"])),
+        "stablecoin_prices",
+        "ix_stablecoin_prices_coin_exchange",
+    ),
+    (
+        "active platform ids",
+        select(PlatformInfo.id).where(PlatformInfo.is_active),
+        "platform_info",
+        "ix_platform_info_active",
+    ),
+    (
+        "active platforms (GET /api/platforms)",
+        select(PlatformInfo).where(PlatformInfo.is_active == True),
+        "platform_info",
+        "ix_platform_info_active",
+    ),
+    (
+        "manual prices by coin",
+        select(ManualPrice, PlatformInfo.last_updated)
+        .join(PlatformInfo, PlatformInfo.id == ManualPrice.platform_id)
+        .where(ManualPrice.coin.in_(["usdt"]), ManualPrice.active, PlatformInfo.is_manual, PlatformInfo.is_active),
+        "manual_price",
+        "ix_manual_price_coin",
+    ),
+    (
+        "stale crypto prices",
+        select(CryptoPrice.exchange, CryptoPrice.coin).where(
+            CryptoPrice.last_updated < datetime.datetime.now(datetime.timezone.utc) - STALE_AFTER
+        ),
+        "crypto_prices",
+        "ix_crypto_prices_last_updated",
+    ),
+]
+
+
+def add_synthetic_prices(connection, exchanges: int) -> None:
+    for table, coins in (("crypto_prices", settings.crypto_coins), ("stablecoin_prices", settings.stable_coins)):
+        connection.execute(
+            text(
+                f"INSERT INTO {table}"
+                " (exchange, coin, buy_cop, sell_cop, buy_usd, sell_usd, spread, direct_cop, usd_bridge, last_updated)"
+                " SELECT 'explain' || n, coin, 4160 + n, 4140 + n, 0, 0, 0.5, true, '', now() - n * interval '1 minute'"
+                " FROM generate_series(1, :exchanges) AS n, unnest(CAST(:coins AS text[])) AS coin"
+            ),
+            {"exchanges": exchanges, "coins": coins},
+        )
+        connection.execute(text(f"ANALYZE {table}"))
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(connection, statement) -> dict:
+    sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--exchanges", type=int, default=200, help="synthetic exchanges added before EXPLAIN")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    ensure_schema_current()
+    failures = 0
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        add_synthetic_prices(connection, args.exchanges)
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        for description, statement, table, index in CHECKS:
+            plan = explain(connection, statement)
+            scans = [node for node in plan_nodes(plan) if node.get("Relation Name") == table or "Index Name" in node]
+            used = any(node["Node Type"] in INDEX_NODES and node.get("Index Name") == index for node in scans)
+            seq = any(node["Node Type"] == "Seq Scan" for node in scans)
+            ok = used and not seq
+            failures += not ok
+            found = ", ".join(f"{node['Node Type']} {node.get('Index Name', '')}".strip() for node in scans)
+            print(f"{'✅' if ok else '❌'} {description}: {found or 'no scan on ' + table}")
+            if args.verbose or not ok:
+                print(json.dumps(plan, indent=2))
+        transaction.rollback()  # the synthetic rows and their statistics
+
+    if failures:
+        print(f"❌ {failures} of {len(CHECKS)} queries can't use their index.")
+        sys.exit(1)
+    print(f"✅ All {len(CHECKS)} queries use their index.")
+
+
+if __name__ == "__main__":
+    main()
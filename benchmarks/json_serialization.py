@@ -0,0 +1,95 @@
+"""
+json_serialization.py — Serialization cost per response of the hot read endpoints.
+
+Run against the database configured in .env (reads only):
+  .venv/bin/python3 benchmarks/json_serialization.py [--repeat 2000]
+
+For GET /api/prices/{coin} (the coin with the most rows), GET /api/prices,
+GET /api/platforms and GET /api/config, times turning the handler's content
+into response bytes three ways:
+  fastapi — what FastAPI did per request before: response_model validation and
+            serialization, jsonable_encoder, then JSONResponse (stdlib json)
+  orjson  — encode_json() per request
+  cached  — the bytes the routes now serve: encoded once per data version
+            (CachedPrice.body), so a request only reads or joins them
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.json_response import encode_json
+from app.db.session import engine
+from app.models import PlatformInfo
+from app.schemas.config import ConfigResponse
+from app.schemas.platform import PlatformItem
+from app.schemas.price import PriceResponse, PricesResponse
+from app.services.platform_snapshot import platform_item
+from app.services.price_snapshot import get_cached_prices_async
+
+
+def fastapi_body(adapter, content) -> bytes:
+    validated = adapter.validate_python(content)
+    return JSONResponse(jsonable_encoder(adapter.dump_python(validated, mode="json"))).body
+
+
+def measure(function, repeat: int) -> float:
+    seconds = min(timeit.repeat(function, number=repeat, repeat=3)) / repeat
+    return seconds * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    cached = asyncio.run(get_cached_prices_async(settings.crypto_coins + settings.stable_coins))
+    largest = max(cached, key=lambda entry: len(entry.response["prices"]))
+    with Session(engine) as session:
+        platforms = {
+            platform.id: platform_item(platform, "es")
+            for platform in session.exec(select(PlatformInfo).where(PlatformInfo.is_active == True))
+        }
+    config = {"crypto": settings.crypto_coins, "stablecoins": settings.stable_coins}
+    all_prices = {"coins": [entry.response for entry in cached]}
+    platforms_body = encode_json(platforms)
+    config_body = encode_json(config)
+
+    cases = [
+        (
+            f"/prices/{largest.response['coin']} ({len(largest.response['prices'])} rows)",
+            TypeAdapter(PriceResponse),
+            largest.response,
+            lambda: largest.body,
+        ),
+        (
+            f"/prices ({len(cached)} coins)",
+            TypeAdapter(PricesResponse),
+            all_prices,
+            lambda: b'{"coins":[' + b",".join(entry.body for entry in cached) + b"]}",
+        ),
+        (f"/platforms ({len(platforms)})", TypeAdapter(dict[str, PlatformItem]), platforms, lambda: platforms_body),
+        ("/config", TypeAdapter(ConfigResponse), config, lambda: config_body),
+    ]
+
+    print(f"{'µs per response':<28} {'fastapi':>9} {'orjson':>9} {'cached':>9} {'bytes':>8}")
+    for label, adapter, content, cached_body in cases:
+        assert adapter.validate_json(encode_json(content)) == adapter.validate_python(content)
+        old = measure(lambda: fastapi_body(adapter, content), args.repeat)
+        new = measure(lambda: encode_json(content), args.repeat)
+        served = measure(cached_body, args.repeat)
+        print(f"{label:<28} {old:9.1f} {new:9.1f} {served:9.2f} {len(cached_body()):8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+price_stream_subscribers.py — Memory per idle /api/prices/stream subscriber, and fan-out time.
+
+Run against the database configured in .env (reads the prices already there;
+bumps data_version once, which changes no rows):
+  .venv/bin/python3 benchmarks/price_stream_subscribers.py [--subscribers 5000]
+
+Starts --subscribers consumers of price_broadcaster.updates() (what each SSE
+or WebSocket connection runs) on one event loop and waits for their first
+event. Then reports:
+  - Python heap per idle subscriber (tracemalloc), once they are all waiting;
+  - how long one data version change takes to reach every subscriber.
+Socket buffers and the ASGI server's per-connection state are not included.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.db.migrations import run_migrations
+from app.db.session import engine
+from app.services.data_version import bump_data_version, data_changed
+from app.services.price_stream import price_broadcaster
+
+COINS = settings.crypto_coins + settings.stable_coins
+
+
+async def subscriber(received: list[int], index: int, started: list[int], all_started: asyncio.Event) -> None:
+    async for version, payload in price_broadcaster.updates(COINS, None):
+        if payload is None:
+            continue
+        if received[index] < 0:
+            started[0] += 1
+            if started[0] == len(received):
+                all_started.set()
+        received[index] = version
+
+
+async def main_async(count: int) -> None:
+    settings.price_stream_max_subscribers = max(settings.price_stream_max_subscribers, count)
+    received = [-1] * count
+    started = [0]
+    all_started = asyncio.Event()
+
+    # Warm up: load the snapshot, so only subscriber state is measured
+    warmup = price_broadcaster.updates(COINS, None)
+    await warmup.__anext__()
+    await warmup.aclose()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [asyncio.create_task(subscriber(received, index, started, all_started)) for index in range(count)]
+    await all_started.wait()
+    await asyncio.sleep(0.1)  # let every subscriber park on the shared event
+    idle = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{count} idle subscribers: {idle / 1024 / 1024:.1f} MiB, {idle / count / 1024:.2f} KiB each")
+
+    old_version = received[0]
+    with Session(engine) as session:
+        version = bump_data_version(session)
+        session.commit()
+    started = time.perf_counter()
+    data_changed(version)
+    while min(received) < version:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - started
+    print(f"version {old_version} → {version} reached all {count} subscribers in {elapsed * 1000:.1f} ms")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    args = parser.parse_args()
+
+    run_migrations()
+    asyncio.run(main_async(args.subscribers))
+
+
+if __name__ == "__main__":
+    main()
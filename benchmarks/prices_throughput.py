@@ -0,0 +1,104 @@
+"""
+prices_throughput.py — Requests/sec of GET /api/prices/{coin}, rebuilt per request vs. snapshot.
+
+Run against the database configured in .env (uses the platforms and prices
+already there; nothing is written):
+  .venv/bin/python3 benchmarks/prices_throughput.py [--seconds 5] [--threads 8]
+
+Both modes call the handler logic with `--threads` concurrent callers, cycling
+through every configured coin:
+  rebuild  — build_price_response() with a fresh session per request (old
+             path), from worker threads the way FastAPI runs sync routes
+  snapshot — get_cached_price_async() from the in-memory price snapshot, from
+             tasks on one event loop the way the async route runs
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.db.session import engine
+from app.services.price_snapshot import get_cached_price_async
+from app.services.pricing import build_price_response
+
+COINS = settings.crypto_coins + settings.stable_coins
+
+
+def rebuild(coin: str) -> dict:
+    with Session(engine) as session:
+        return build_price_response(session, coin)
+
+
+def measure(label: str, handler, seconds: float, threads: int) -> None:
+    latencies: list[float] = []
+    stop_at = time.perf_counter() + seconds
+    lock = threading.Lock()
+
+    def worker(offset: int) -> None:
+        local = []
+        for coin in itertools.islice(itertools.cycle(COINS), offset, None):
+            if time.perf_counter() >= stop_at:
+                break
+            started = time.perf_counter()
+            handler(coin)
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    handler(COINS[0])  # warm up (connection pool)
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    report(label, latencies, seconds)
+
+
+async def measure_async(label: str, handler, seconds: float, tasks: int) -> None:
+    latencies: list[float] = []
+
+    async def worker(offset: int) -> None:
+        for coin in itertools.islice(itertools.cycle(COINS), offset, None):
+            if time.perf_counter() >= stop_at:
+                break
+            started = time.perf_counter()
+            await handler(coin)
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0)  # a current snapshot never suspends: let the other callers run
+
+    await handler(COINS[0])  # warm up (first snapshot build)
+    stop_at = time.perf_counter() + seconds
+    await asyncio.gather(*(worker(index) for index in range(tasks)))
+    report(label, latencies, seconds)
+
+
+def report(label: str, latencies: list[float], seconds: float) -> None:
+    print(
+        f"{label:<9} {len(latencies) / seconds:9.0f} req/s  "
+        f"p50={statistics.median(latencies) * 1000:7.3f} ms  "
+        f"max={max(latencies) * 1000:7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    measure("rebuild", rebuild, args.seconds, args.threads)
+    asyncio.run(measure_async("snapshot", get_cached_price_async, args.seconds, args.threads))
+
+
+if __name__ == "__main__":
+    main()
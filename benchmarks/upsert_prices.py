@@ -0,0 +1,104 @@
+"""
+upsert_prices.py — Compare the per-record upsert loop with the bulk upsert.
+
+Run against the database configured in .env:
+  .venv/bin/python3 benchmarks/upsert_prices.py [--rows 40] [--repeat 5]
+
+The loop is the previous write path, one INSERT ... ON CONFLICT DO UPDATE per
+record that overwrites every column; the bulk path is upsert_prices(). Both
+write the same synthetic records inside a transaction that is rolled back at
+the end, so no real price rows are changed. For each path it
+prints the number of statements sent to Postgres (= round trips) and the
+median wall time.
+"""
+
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session
+
+from app.db.migrations import run_migrations
+from app.db.session import engine
+from app.fetcher import TARGET_COINS, build_price_record, get_price_model, upsert_prices
+
+
+def build_records(rows: int):
+    """Synthetic records spread over TARGET_COINS, both price tables included."""
+    records = []
+    for index in range(rows):
+        coin = TARGET_COINS[index % len(TARGET_COINS)]
+        records.append(
+            build_price_record(
+                exchange=f"bench{index // len(TARGET_COINS)}",
+                coin=coin,
+                buy_cop=4160.0 + index,
+                sell_cop=4140.0 + index,
+                last_updated=datetime.datetime(2024, 4, 3, 15, tzinfo=datetime.timezone.utc),
+            )
+        )
+    return records
+
+
+def run_loop(session: Session, records) -> None:
+    for record in records:
+        payload = record.as_db_dict()
+        statement = insert(get_price_model(record.coin)).values(payload)
+        statement = statement.on_conflict_do_update(
+            index_elements=["exchange", "coin"],
+            set_={column: value for column, value in payload.items() if column not in {"exchange", "coin"}},
+        )
+        session.exec(statement)
+
+
+def run_bulk(session: Session, records) -> None:
+    upsert_prices(session, records)
+
+
+def measure(label: str, func, records, repeat: int) -> None:
+    statements = 0
+
+    def count_statement(*_args, **_kwargs):
+        nonlocal statements
+        statements += 1
+
+    timings = []
+    for _ in range(repeat):
+        with Session(engine) as session:
+            session.connection()  # open the transaction before timing
+            event.listen(engine, "before_cursor_execute", count_statement)
+            statements = 0
+            started = time.perf_counter()
+            func(session, records)
+            session.flush()
+            timings.append(time.perf_counter() - started)
+            event.remove(engine, "before_cursor_execute", count_statement)
+            session.rollback()
+
+    print(
+        f"{label:<6} rows={len(records):<4} round_trips={statements:<4} "
+        f"median={statistics.median(timings) * 1000:.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run_migrations()
+    records = build_records(args.rows)
+    measure("loop", run_loop, records, args.repeat)
+    measure("bulk", run_bulk, records, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,9 @@
-from app.main import app
+import os
+
+if os.getenv("STARTUP_PROFILE"):
+    from startup_profile import profile_imports
+
+    with profile_imports():
+        from app.main import app
+else:
+    from app.main import app
@@ -0,0 +1,33 @@
+"""
+migrate.py — Applies pending database schema migrations (app/db/migrations.py).
+
+Run once per deploy that changes the schema:
+  .venv/bin/python3 migrate.py            # apply pending migrations
+  .venv/bin/python3 migrate.py --status   # print current vs. latest version
+
+Safe to run multiple times — applied migrations are recorded in schema_version
+and skipped.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.db.migrations import print_status, run_migrations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="store_true", help="print the current version and pending migrations")
+    args = parser.parse_args()
+
+    if args.status:
+        print_status()
+    else:
+        run_migrations()
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,10 @@ import os
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from app.db.session import create_db_and_tables, engine
+from app.db.migrations import run_migrations
+from app.db.session import engine
+from app.services.data_version import bump_data_version
+from app.services.manual_prices import sync_manual_prices
 from app.models import PlatformInfo
 from sqlmodel import Session
 
@@ -273,10 +276,12 @@ PLATFORMS = [
 
 
 def seed():
-    create_db_and_tables()
+    run_migrations()
     with Session(engine) as session:
         for platform in PLATFORMS:
             session.merge(platform)  # insert or update — safe to run multiple times
+            sync_manual_prices(session, platform.id, platform.category, platform.manual_prices)
+        bump_data_version(session)  # so API caches and ETags pick up the new data
         session.commit()
     print(f"✅ Seeded {len(PLATFORMS)} platforms into platform_info.")
 
@@ -0,0 +1,56 @@
+"""
+startup_profile.py — Import-time profile of a cold start.
+
+index.py enables it when STARTUP_PROFILE=1 is set (e.g. temporarily in the
+Vercel project settings). After the app is imported it prints the total import
+time and the modules that took longest, by self time (excluding the modules
+they imported in turn):
+
+  ⏱️ Startup imports: 812.4 ms
+     fastapi.openapi.models    236.7 ms
+     ...
+"""
+
+import builtins
+import contextlib
+import importlib.util
+import time
+from typing import Iterator
+
+MIN_RECORDED_SECONDS = 0.0005  # ignore imports of modules that were already loaded
+
+
+@contextlib.contextmanager
+def profile_imports(top: int = 15) -> Iterator[None]:
+    original_import = builtins.__import__
+    self_seconds: dict[str, float] = {}
+    child_seconds: list[float] = []  # one accumulator per import in progress
+
+    def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+        child_seconds.append(0.0)
+        started = time.perf_counter()
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            own = elapsed - child_seconds.pop()
+            if child_seconds:
+                child_seconds[-1] += elapsed
+            if own >= MIN_RECORDED_SECONDS:
+                if level and globals:
+                    with contextlib.suppress(ImportError, ValueError):
+                        name = importlib.util.resolve_name("." * level + name, globals.get("__package__"))
+                self_seconds[name] = self_seconds.get(name, 0.0) + own
+
+    started = time.perf_counter()
+    builtins.__import__ = timed_import
+    try:
+        yield
+    finally:
+        builtins.__import__ = original_import
+        total = time.perf_counter() - started
+        print(f"⏱️ Startup imports: {total * 1000:.1f} ms")
+        slowest = sorted(self_seconds.items(), key=lambda item: item[1], reverse=True)[:top]
+        width = max((len(name) for name, _ in slowest), default=0)
+        for name, seconds in slowest:
+            print(f"   {name:<{width}}  {seconds * 1000:7.1f} ms")